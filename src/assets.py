@@ -2,12 +2,16 @@ import pygame
 import os
 import math
 import random
+from collections import OrderedDict
 
 class Assets:
     _instance = None
+    SCALED_CACHE_LIMIT = 512 # Max number of scaled surfaces kept around
     
     def __init__(self):
         self.sprites = {}
+        # Scaled sprite cache: (name, (w, h)) or (name, (w, h), tint) -> Surface, oldest first
+        self.scaled_cache = OrderedDict()
         self.load_all()
 
     @classmethod
@@ -322,3 +326,48 @@ class Assets:
 
     def get_sprite(self, name):
         return self.sprites.get(name)
+
+    def get_scaled(self, name, size):
+        # size is either an int (square) or a (w, h) tuple in pixels
+        if isinstance(size, tuple):
+            key_size = (int(size[0]), int(size[1]))
+        else:
+            key_size = (int(size), int(size))
+        key = (name, key_size)
+
+        scaled = self.scaled_cache.get(key)
+        if scaled is not None:
+            self.scaled_cache.move_to_end(key)
+            return scaled
+
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            return None
+        scaled = pygame.transform.scale(sprite, (max(1, key_size[0]), max(1, key_size[1])))
+        self.scaled_cache[key] = scaled
+        # LRU eviction
+        while len(self.scaled_cache) > self.SCALED_CACHE_LIMIT:
+            self.scaled_cache.popitem(last=False)
+        return scaled
+
+    def get_tinted(self, name, size, color):
+        # Scaled sprite multiplied by color (BLEND_RGB_MULT), cached alongside the scaled ones
+        key = (name, (int(size), int(size)), color)
+        tinted = self.scaled_cache.get(key)
+        if tinted is not None:
+            self.scaled_cache.move_to_end(key)
+            return tinted
+
+        scaled = self.get_scaled(name, size)
+        if scaled is None:
+            return None
+        tinted = scaled.copy()
+        tinted.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+        self.scaled_cache[key] = tinted
+        while len(self.scaled_cache) > self.SCALED_CACHE_LIMIT:
+            self.scaled_cache.popitem(last=False)
+        return tinted
+
+    def flush_scaled(self):
+        # Called when the zoom level changes; old sizes won't be drawn again
+        self.scaled_cache.clear()
@@ -1,5 +1,6 @@
 import pygame
 from .config import *
+from .assets import Assets
 
 class Camera:
     def __init__(self, width, height):
@@ -44,5 +45,9 @@ class Camera:
         self.offset_y -= dy / self.zoom_level
 
     def set_zoom(self, change):
+        old_zoom = self.zoom_level
         self.zoom_level += change
         self.zoom_level = max(0.5, min(self.zoom_level, 3.0))
+        if self.zoom_level != old_zoom:
+            # Scaled sprites for the old zoom are stale now
+            Assets.get().flush_scaled()
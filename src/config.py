@@ -19,9 +19,59 @@ STATE_GAME = "GAME"
 # World Configuration
 TILE_SIZE = 16
 WORLD_HEIGHT = 100
+# Tile type ids stored in World.tiles (one byte per tile)
+TILE_AIR = 0
+TILE_GRASS = 1
+TILE_DIRT = 2
+TILE_STONE = 3
+TILE_NAMES = ["air", "grass", "dirt", "stone"] # Indexed by tile id, also the sprite names
+CHUNK_SIZE = 16 # Tiles per side of a pre-rendered terrain chunk
+SPATIAL_CELL_SIZE = 8 # Tiles per side of a building spatial hash bucket
+
+WAREHOUSE_RADIUS = 10 # Staffed warehouses boost production within this range
+REFINERY_RADIUS = 10 # Blast Furnaces must be built this close to a Stone Refinery
+
+# Rendering
+LIGHT_SOURCE_TYPES = ("House", "Blast Furnace", "Stone Refinery", "Laboratory") # Buildings that glow at night
+LIGHT_RADIUS = 3 # Tiles
+PARTICLE_CAPACITY = 2048 # Live particles; more are dropped
+PARTICLE_EMIT_BUDGET = 64 # New particles accepted per frame; more are dropped
+LIGHTMAP_DOWNSAMPLE = 4 # Light map resolution divisor: a tile is TILE_SIZE // LIGHTMAP_DOWNSAMPLE light map pixels across (smooth-scaled when drawn)
+
+# Simulation Speed
+TIME_SCALES = [1, 10, 50, 100, 1000] # Speed button cycles through these
+TICK_BUDGET_MS = 8 # Max real time spent running catch-up ticks per frame
+MAX_FRAME_MS = 250 # Longer frame gaps (window drag, hitch) are clamped to this
+MAX_BACKLOG_TICKS = 5 # Ticks kept queued when the budget runs out; the rest are dropped
+SPEED_SMOOTHING = 0.05 # Per-frame weight of the newest frame in the achieved speed the HUD shows
+SPEED_LAG_WARNING = 0.9 # HUD shows the achieved speed once it falls below this share of the selected one
+
+# Villagers
+ENTITY_HZ = 20 # Villager/trader movement steps per second of game time (rendering interpolates between steps)
+MEAL_INTERVAL = 60 # Seconds of game time (ticks) between meals; each meal is 1 food
+# Villager sprite tint (shirt color) by job; other jobs are drawn untinted
+JOB_COLORS = {
+    "Logging Workshop": (139, 69, 19), # Brown
+    "Stone Refinery": (50, 50, 255),   # Blue
+    "Blast Furnace": (128, 0, 128),    # Purple
+    "Mine": (20, 20, 20),              # Black
+    "Farm": (34, 139, 34)              # Green
+}
+
+# Production
+VECTOR_PRODUCTION_THRESHOLD = 200 # Use the NumPy production path from this many buildings (if NumPy is installed)
+
+# Saves
+SAVE_FORMAT = "binary" # "binary" (compressed, see save_format.py) or "json"
+SAVE_EXT = ".sav" # Binary saves; JSON saves (older versions, exports) use .json
+JOURNAL_EXT = ".journal" # Autosave deltas on top of the last full save, see save_journal.py
+JOURNAL_COMPACT_BYTES = 256 * 1024 # Write a fresh full save once the journal grows past this
+SAVE_INDEX = "_index.json" # Per-world summaries for the load screen (world names are alphanumeric, so no clash)
 
 WORLD_SIZES = {
     "Small": 75,
     "Medium": 150,
-    "Large": 300
+    "Large": 300,
+    "Huge": 2000,
+    "Enormous": 10000
 }
@@ -1,34 +1,200 @@
 import random
 import math
+from .config import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Villager states, stored as small ints in the VillagerStore
+STATE_NAMES = ["IDLE", "WANDER", "WALK", "WORKING"]
+IDLE, WANDER, WALK, WORKING = range(4)
+
+# Movement was tuned per 60 FPS frame; entities now step ENTITY_HZ times
+# per game second, so scale the per-frame values up to one step
+STEP_FRAMES = FPS / ENTITY_HZ
+VILLAGER_SPEED = 0.05 * STEP_FRAMES
+GRAVITY = 0.01 * STEP_FRAMES ** 2
+# The floor check only looks at the tile below the feet, so a faller must move
+# less than a tile per step or it can pass through the ground
+MAX_FALL_SPEED = 0.9
+WANDER_CHANCE = 1 - 0.99 ** STEP_FRAMES # Chance an idle villager starts wandering each step
+
+class VillagerStore:
+    # Struct-of-arrays storage for every villager. Columns are NumPy arrays
+    # (with spare capacity) when NumPy is installed, plain lists otherwise.
+    # Rows are swap-removed, so a villager's index can change; Villager views
+    # are kept pointing at their current row.
+    FLOAT_COLUMNS = ("x", "y", "prev_x", "prev_y", "vy", "target_x", "work_x")
+    INT_COLUMNS = ("state", "job")
+
+    def __init__(self):
+        self.count = 0
+        self.views = [] # Villager view per row
+        self.workplaces = [] # Building per row (or None)
+        self.job_names = ["Unemployed"]
+        self.job_ids = {"Unemployed": 0}
+        self.unemployed = {} # Villager views with no job, oldest first (dict used as an ordered set)
+        self.roster_version = 0 # Bumped when villagers arrive, leave, or join the unemployed pool
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            setattr(self, name, np.zeros(16, dtype=np.float64 if name in self.FLOAT_COLUMNS else np.int32) if np is not None else [])
+
+    def job_id(self, job):
+        if job not in self.job_ids:
+            self.job_ids[job] = len(self.job_names)
+            self.job_names.append(job)
+        return self.job_ids[job]
+
+    def append(self, view, **values):
+        i = self.count
+        if np is not None:
+            if i == len(self.x):
+                for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+                    col = getattr(self, name)
+                    setattr(self, name, np.concatenate([col, np.zeros_like(col)]))
+            for name, value in values.items():
+                getattr(self, name)[i] = value
+        else:
+            for name, value in values.items():
+                getattr(self, name).append(value)
+        self.views.append(view)
+        self.workplaces.append(None)
+        self.count += 1
+        view.index = i
+        if values["job"] == 0:
+            self.unemployed[view] = None
+        self.roster_version += 1
+
+    def extend(self, views, **columns):
+        # Bulk append: every column is a list with one value per new view
+        start = self.count
+        n = len(views)
+        if np is not None:
+            capacity = len(self.x)
+            if start + n > capacity:
+                while capacity < start + n:
+                    capacity *= 2
+                for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+                    col = getattr(self, name)
+                    grown = np.zeros(capacity, dtype=col.dtype)
+                    grown[:start] = col[:start]
+                    setattr(self, name, grown)
+            for name, values in columns.items():
+                getattr(self, name)[start:start + n] = values
+        else:
+            for name, values in columns.items():
+                getattr(self, name).extend(values)
+        self.views.extend(views)
+        self.workplaces.extend([None] * n)
+        self.count += n
+        for i, view in enumerate(views, start):
+            view.index = i
+        for view, job in zip(views, columns["job"]):
+            if job == 0:
+                self.unemployed[view] = None
+        self.roster_version += 1
+
+    def column_copy(self, name):
+        # Copy of a column's live rows, in the column's own type (a NumPy array
+        # or a list); as_list turns it into plain Python values
+        col = getattr(self, name)
+        if np is not None:
+            return col[:self.count].copy()
+        return list(col)
+
+    @staticmethod
+    def as_list(column):
+        return column.tolist() if np is not None else column
+
+    def remove(self, i):
+        view = self.views[i]
+        last = self.count - 1
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            col = getattr(self, name)
+            col[i] = col[last]
+            if np is None:
+                col.pop()
+        moved = self.views[last]
+        self.views[i] = moved
+        self.workplaces[i] = self.workplaces[last]
+        moved.index = i
+        self.views.pop()
+        self.workplaces.pop()
+        self.count -= 1
+        self.unemployed.pop(view, None)
+        self.roster_version += 1
+
+def store_column(name, cast):
+    def get(self):
+        return cast(getattr(self.store, name)[self.row()])
+    def set(self, value):
+        getattr(self.store, name)[self.row()] = value
+    return property(get, set)
 
 class Villager:
-    def __init__(self, x, y, game, job="Unemployed"):
-        self.x = x
-        self.y = y
+    # Lightweight view onto one row of the VillagerStore. The object itself is
+    # stable for the villager's lifetime, so buildings and the UI can hold on to it.
+    x = store_column("x", float)
+    y = store_column("y", float)
+    prev_x = store_column("prev_x", float) # Position at the previous step, for interpolation
+    prev_y = store_column("prev_y", float)
+    vy = store_column("vy", float)
+    target_x = store_column("target_x", float)
+    speed = VILLAGER_SPEED
+
+    def __init__(self, store, game):
+        self.store = store
         self.game = game
-        self.state = "IDLE"
-        self.target_x = x
-        self.speed = 0.05
-        self.vy = 0 # Vertical velocity
-        self.job = job
-        self.assigned_building = None # Building object reference
-        
-        # Food Timer (Random start to stagger consumption)
-        # 60 FPS * 60 Seconds = 3600 frames
-        self.food_timer = random.randint(0, 3600)
+        self.index = -1 # -1 once removed
+
+    def row(self):
+        # A removed villager has no row. Reading or writing through index -1
+        # would silently hit the last live villager instead, so refuse.
+        if self.index < 0:
+            raise ReferenceError("villager has been removed")
+        return self.index
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.store.state[self.row()]]
+
+    @state.setter
+    def state(self, value):
+        self.store.state[self.row()] = STATE_NAMES.index(value)
+
+    @property
+    def job(self):
+        return self.store.job_names[self.store.job[self.row()]]
+
+    @job.setter
+    def job(self, value):
+        store = self.store
+        job = store.job_id(value)
+        store.job[self.row()] = job
+        if job != 0:
+            store.unemployed.pop(self, None)
+        elif self not in store.unemployed:
+            store.unemployed[self] = None
+            store.roster_version += 1
+
+    @property
+    def assigned_building(self):
+        return self.store.workplaces[self.row()]
+
+    @assigned_building.setter
+    def assigned_building(self, building):
+        i = self.row()
+        self.store.workplaces[i] = building
+        self.store.work_x[i] = building.x + 0.5 if building else math.nan
 
     def update(self):
-        # 0. Food Consumption
-        self.food_timer += 1
-        if self.food_timer >= 3600:
-            self.food_timer = 0
-            # Eat 1 food
-            self.game.resource_manager.remove_resource("food", 1)
-        
+        # Per-villager path, used when NumPy isn't available
+        # (food is eaten per tick by TickManager)
         # Check Job Status
         if self.state == "WORKING":
-            if not self.assigned_building or self.assigned_building not in self.game.world.buildings.values():
-                # Fired or building destroyed
+            if not self.assigned_building:
+                # Fired or building destroyed (removal unassigns its workers)
                 self.state = "IDLE"
                 self.job = "Unemployed"
                 self.assigned_building = None
@@ -40,28 +206,19 @@ class Villager:
         # Check block below
         ix = int(self.x)
         iy = int(self.y + 1) # tile below feet
-        
-        below_tile = self.game.world.get_tile(ix, iy)
-        building_below = self.game.world.get_building_at(ix, iy)
-        
+
         is_grounded = False
-        if (below_tile and below_tile.tile_type != "air") or building_below:
+        if self.game.world.is_solid(ix, iy) or self.game.world.get_building_at(ix, iy):
             is_grounded = True
             self.vy = 0
             self.y = math.floor(self.y) # Snap to grid
         else:
-            self.vy += 0.01 # Gravity
+            self.vy = min(self.vy + GRAVITY, MAX_FALL_SPEED)
             self.y += self.vy
 
         # Safety Check: Falling off the world
         if self.y > self.game.world.height + 10:
-            if self in self.game.entity_manager.villagers:
-                # Remove from manager
-                self.game.entity_manager.villagers.remove(self)
-                # Remove from building if assigned
-                if self.assigned_building:
-                    if self in self.assigned_building.assigned_workers:
-                        self.assigned_building.assigned_workers.remove(self)
+            self.game.entity_manager.remove_villager(self)
             return
 
         if not is_grounded:
@@ -72,7 +229,7 @@ class Villager:
             # Move towards building
             target_x = self.assigned_building.x + 0.5 # Center of tile
             dx = target_x - self.x
-            
+
             if abs(dx) < 0.2:
                 # Arrived
                 self.state = "WORKING"
@@ -84,7 +241,7 @@ class Villager:
         else:
             # Wander logic
             if self.state == "IDLE":
-                if random.random() < 0.01:
+                if random.random() < WANDER_CHANCE:
                     self.state = "WANDER"
                     self.target_x = self.x + random.randint(-5, 5)
                     # Clamp to island
@@ -100,18 +257,16 @@ class Villager:
 
     def move_x(self, direction):
         next_x = self.x + direction * self.speed
-        
+
         # Check wall ahead
         next_ix = int(next_x + (0.5 * direction))
         iy_head = int(self.y)
-        wall_tile = self.game.world.get_tile(next_ix, iy_head)
-        wall_building = self.game.world.get_building_at(next_ix, iy_head)
-        
-        if (wall_tile and wall_tile.tile_type != "air") or wall_building:
+        world = self.game.world
+
+        if world.is_solid(next_ix, iy_head) or world.get_building_at(next_ix, iy_head):
             # Jump?
             # Check if space above wall is empty
-            above_wall = self.game.world.get_tile(next_ix, iy_head - 1)
-            if above_wall and above_wall.tile_type == "air":
+            if world.in_bounds(next_ix, iy_head - 1) and not world.is_solid(next_ix, iy_head - 1):
                 self.y -= 1.1 # Jump up
                 self.x += direction * self.speed
             else:
@@ -128,45 +283,223 @@ class Trader:
         self.x = -10
         self.y = 20 # Sky level
         self.target_x = 100 # Default, will be updated on spawn
-        self.speed = 0.05
+        self.speed = 0.05 * STEP_FRAMES
         self.timer = 0
-        
+        self.prev_x, self.prev_y = self.x, self.y
+
     def spawn(self):
         if self.game.world is None: return
         self.active = True
         self.x = -5
         self.y = 20
+        self.prev_x, self.prev_y = self.x, self.y
         self.target_x = self.game.world.width + 5
-        
+
     def update(self):
         if not self.active or self.game.world is None: return
-        
+
+        self.prev_x, self.prev_y = self.x, self.y
         # Move across screen
         self.x += self.speed
         # Bobbing motion
         self.y = 20 + math.sin(self.x * 0.5) * 2
-        
+
         if self.x > self.target_x:
             self.active = False
 
 class EntityManager:
     def __init__(self, game):
         self.game = game
-        self.villagers = []
+        self.store = VillagerStore()
+        self.villagers = self.store.views # Shared list of Villager views, don't mutate
+        self.unemployed = self.store.unemployed # Shared, don't mutate
         self.trader = Trader(game)
+        # Seed NumPy's generator from `random` so seeded runs stay reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64)) if np is not None else None
+
+        # Collision maps for the batched update, rebuilt when buildings change
+        self.solid = None # Terrain only (jump clearance ignores buildings)
+        self.blocked = None # Terrain or building
+        self.maps_key = None
 
     def spawn_villager(self, x, y, job="Unemployed"):
-        v = Villager(x, y, self.game, job)
-        self.villagers.append(v)
+        v = Villager(self.store, self.game)
+        self.store.append(v, x=x, y=y, prev_x=x, prev_y=y, vy=0.0, target_x=x, work_x=math.nan, state=IDLE,
+                          job=self.store.job_id(job))
         return v
 
+    def spawn_villagers(self, xs, ys, jobs):
+        # Bulk spawn (e.g. on load): one store append for the whole batch
+        store = self.store
+        n = len(xs)
+        views = [Villager(store, self.game) for _ in range(n)]
+        job_ids = [store.job_id(job) for job in jobs]
+        xs, ys = list(xs), list(ys)
+        store.extend(views, x=xs, y=ys, prev_x=xs, prev_y=ys, vy=[0.0] * n, target_x=xs,
+                     work_x=[math.nan] * n, state=[IDLE] * n, job=job_ids)
+        return views
+
+    def remove_villager(self, villager):
+        if villager.index < 0:
+            return
+        if villager.assigned_building:
+            self.game.world.unassign_worker(villager)
+        self.store.remove(villager.index)
+        villager.index = -1
+
+    def clear(self):
+        while self.store.count:
+            self.remove_villager(self.villagers[-1])
+
     def update(self):
+        # One fixed step, driven by TickManager
         if self.game.world is None:
             return
-            
-        for v in self.villagers:
-            v.update()
+
+        store = self.store
+        if np is not None:
+            n = store.count
+            store.prev_x[:n] = store.x[:n]
+            store.prev_y[:n] = store.y[:n]
+            self.update_villagers()
+        else:
+            store.prev_x[:] = store.x
+            store.prev_y[:] = store.y
+            for v in list(self.villagers):
+                v.update()
         self.trader.update()
 
     def get_count(self):
         return len(self.villagers)
+
+    def visible_villagers(self, alpha):
+        # (villager, x, y) for everyone outside a building, positioned alpha of
+        # the way from the previous step to the current one
+        store = self.store
+        n = store.count
+        if np is not None:
+            idx = np.flatnonzero(store.state[:n] != WORKING)
+            xs = store.prev_x[idx] + (store.x[idx] - store.prev_x[idx]) * alpha
+            ys = store.prev_y[idx] + (store.y[idx] - store.prev_y[idx]) * alpha
+            views = store.views
+            return [(views[i], x, y) for i, x, y in zip(idx.tolist(), xs.tolist(), ys.tolist())]
+        return [(store.views[i],
+                 store.prev_x[i] + (store.x[i] - store.prev_x[i]) * alpha,
+                 store.prev_y[i] + (store.y[i] - store.prev_y[i]) * alpha)
+                for i in range(n) if store.state[i] != WORKING]
+
+    def rebuild_maps(self):
+        world = self.game.world
+        key = (id(world), world.layout_version)
+        if key == self.maps_key:
+            return
+        self.maps_key = key
+        self.solid = np.frombuffer(world.tiles, dtype=np.uint8) != TILE_AIR
+        self.blocked = self.solid.copy()
+        if world.buildings:
+            pos = np.array(list(world.buildings), dtype=np.int64)
+            self.blocked[pos[:, 0] * world.height + pos[:, 1]] = True
+
+    def lookup(self, grid, ix, iy):
+        # grid[ix, iy] for each pair, False outside the world
+        world = self.game.world
+        inside = (ix >= 0) & (ix < world.width) & (iy >= 0) & (iy < world.height)
+        return inside & grid[np.where(inside, ix * world.height + iy, 0)]
+
+    def update_villagers(self):
+        # Batched version of Villager.update over the whole store
+        store = self.store
+        n = store.count
+        if n == 0:
+            return
+        world = self.game.world
+        self.rebuild_maps()
+        x, y, vy = store.x[:n], store.y[:n], store.vy[:n]
+        target_x, work_x = store.target_x[:n], store.work_x[:n]
+        state = store.state[:n]
+
+        # Check Job Status. Fired workers, and workers of removed buildings,
+        # have been unassigned so they have no work_x.
+        working = state == WORKING
+        self.eject_workers(np.flatnonzero(working & np.isnan(work_x)))
+        active = ~working # Workers don't move or apply gravity while inside
+
+        # 1. Gravity
+        ix = x.astype(np.int64)
+        grounded = self.lookup(self.blocked, ix, (y + 1).astype(np.int64))
+        landed = active & grounded
+        vy[landed] = 0
+        y[landed] = np.floor(y[landed]) # Snap to grid
+        falling = active & ~grounded
+        vy[falling] = np.minimum(vy[falling] + GRAVITY, MAX_FALL_SPEED)
+        y[falling] += vy[falling]
+
+        # Safety Check: Falling off the world
+        fallen = np.flatnonzero(active & (y > world.height + 10))
+
+        # 2. AI Logic (grounded villagers only)
+        has_work = ~np.isnan(work_x)
+        direction = np.zeros(n)
+
+        # Move towards building
+        dx = np.where(has_work, work_x - x, 0.0)
+        commuting = landed & has_work
+        arrived = commuting & (np.abs(dx) < 0.2)
+        state[arrived] = WORKING
+        x[arrived] = work_x[arrived] # Snap to center
+        walking = commuting & ~arrived
+        state[walking] = WALK
+        direction[walking] = np.where(dx[walking] > 0, 1, -1)
+
+        # Wander logic
+        free = landed & ~has_work
+        start = free & (state == IDLE)
+        start[start] = self.rng.random(int(start.sum())) < WANDER_CHANCE
+        if start.any():
+            state[start] = WANDER
+            offset = self.rng.integers(-5, 6, int(start.sum()))
+            target_x[start] = np.clip(x[start] + offset, 0, world.width - 1) # Clamp to island
+        wandering = free & (state == WANDER)
+        wdx = target_x - x
+        stopped = wandering & (np.abs(wdx) < 0.1)
+        state[stopped] = IDLE
+        roaming = wandering & ~stopped
+        direction[roaming] = np.where(wdx[roaming] > 0, 1, -1)
+
+        moving = np.flatnonzero(walking | roaming)
+        if len(moving):
+            self.move_villagers(moving, direction[moving])
+
+        # Highest index first so swap-removal doesn't disturb the rest
+        for i in fallen[::-1]:
+            self.remove_villager(store.views[i])
+
+    def move_villagers(self, idx, direction):
+        store = self.store
+        x, y = store.x[idx], store.y[idx]
+        next_x = x + direction * VILLAGER_SPEED
+
+        # Check wall ahead
+        next_ix = (next_x + 0.5 * direction).astype(np.int64)
+        iy_head = y.astype(np.int64)
+        wall = self.lookup(self.blocked, next_ix, iy_head)
+        # Jump if the space above the wall is open (and inside the world)
+        world = self.game.world
+        above_inside = (next_ix >= 0) & (next_ix < world.width) & (iy_head - 1 >= 0) & (iy_head - 1 < world.height)
+        jump = wall & above_inside & ~self.lookup(self.solid, next_ix, iy_head - 1)
+
+        store.x[idx] = np.where(~wall | jump, next_x, x)
+        store.y[idx] = np.where(jump, y - 1.1, y)
+        # Blocked, stop
+        blocked = idx[wall & ~jump]
+        wanderers = blocked[store.state[blocked] == WANDER]
+        store.state[wanderers] = IDLE
+
+    def eject_workers(self, idx):
+        for i in idx:
+            # Fired or building destroyed
+            v = self.store.views[i]
+            v.state = "IDLE"
+            v.job = "Unemployed"
+            # Eject slightly to the side
+            v.x += random.choice([-1, 1])
@@ -15,6 +15,8 @@ from .tick_manager import TickManager
 from .save_manager import SaveManager
 from .assets import Assets
 from .particles import ParticleManager
+from .terrain_cache import TerrainCache
+from .lighting import Lighting
 
 class Game:
     def __init__(self):
@@ -47,6 +49,8 @@ class Game:
         self.input_handler = None
         self.entity_manager = None
         self.tick_manager = None
+        self.terrain_cache = None
+        self.lighting = None
         
         # Interaction state
         self.is_dragging = False
@@ -185,10 +189,7 @@ class Game:
                     self.ui_manager.open_window(WorkerAssignmentWindow(self.resource_manager, self.world))
                     return
                 elif self.hud.speed_btn_rect.collidepoint(event.pos):
-                    if self.tick_manager.time_scale == 1:
-                        self.tick_manager.time_scale = 10
-                    else:
-                        self.tick_manager.time_scale = 1
+                    self.tick_manager.cycle_speed()
                     return
                 elif self.hud.codex_icon_rect.collidepoint(event.pos):
                     self.ui_manager.windows = []
@@ -244,37 +245,30 @@ class Game:
 
     def update(self):
         if self.state == STATE_GAME:
-            self.tick_manager.update()
-            self.entity_manager.update()
+            self.tick_manager.update() # Also steps villagers and the trader
             self.particle_manager.update()
             
             # Time tracking for food mechanics
             dt = self.clock.get_time() / 1000.0
             self.game_time += dt
             
-            # Auto-save every 3 minutes (180 seconds)
+            # Auto-save every 3 minutes (180 seconds), written in the background
             self.auto_save_timer += dt
             if self.auto_save_timer >= 180:
                 self.auto_save_timer = 0
-                self.save_manager.save_game()
-                print("Auto-saving game...")
+                self.save_manager.autosave()
+            self.save_manager.update()
 
             current_minute = int(self.game_time / 60)
             if current_minute > self.last_minute_tick:
                 # Every new minute
                 self.last_minute_tick = current_minute
                 if current_minute > 3:
-                    # Only drop production efficiency if OUT of food
-                    if self.resource_manager.inventory.get("food", 0) <= 0:
-                        self.resource_manager.food_efficiency = max(0.0, self.resource_manager.food_efficiency - 0.05)
-                    else:
-                        # Optional: recover efficiency if fed? 
-                        # Let's keep it at current level or slowly recover to 1.0
-                        self.resource_manager.food_efficiency = min(1.0, self.resource_manager.food_efficiency + 0.05)
+                    self.resource_manager.update_food_efficiency()
             
             # Launch Logic
-            for b in self.world.buildings.values():
-                if b.type == "Rocket Ship" and b.is_launching:
+            for b in self.world.get_buildings("Rocket Ship"):
+                if b.is_launching:
                     b.launch_y_offset += 2
                     if b.launch_y_offset > 300 and not b.game_over_triggered:
                         b.game_over_triggered = True
@@ -293,10 +287,12 @@ class Game:
         
         cloud_sprite = self.assets.get_sprite("cloud")
         if cloud_sprite:
+            clouds = []
             for i in range(5):
                 cx = (i * 400 - self.camera.offset_x * 0.3) % (SCREEN_WIDTH + 100) - 50
                 cy = 100 + (i * 50) % 200
-                self.screen.blit(cloud_sprite, (cx, cy))
+                clouds.append((cloud_sprite, (cx, cy)))
+            self.screen.fblits(clouds)
         
         start_col = int(self.camera.offset_x / TILE_SIZE)
         end_col = int((self.camera.offset_x + SCREEN_WIDTH / self.camera.zoom_level) / TILE_SIZE) + 1
@@ -306,124 +302,77 @@ class Game:
         start_col, end_col = max(0, start_col), min(self.world.width, end_col)
         start_row, end_row = max(0, start_row), min(self.world.height, end_row)
 
-        for x in range(start_col, end_col):
-            for y in range(start_row, end_row):
-                tile = self.world.get_tile(x, y)
-                screen_x, screen_y = self.camera.world_to_screen(x, y)
-                size = TILE_SIZE * self.camera.zoom_level
-                rect = pygame.Rect(int(screen_x), int(screen_y), int(size) + 1, int(size) + 1)
-                
-                if tile and tile.tile_type != "air":
-                    sprite = self.assets.get_sprite(tile.tile_type)
-                    if sprite:
-                        scaled = pygame.transform.scale(sprite, (int(size) + 1, int(size) + 1))
-                        self.screen.blit(scaled, rect)
-                
-                building = self.world.get_building_at(x, y)
-                if building:
-                    sprite = self.assets.get_sprite(building.type)
-                    draw_y = rect.y
-                    if building.type == "Rocket Ship" and building.is_launching:
-                        draw_y -= building.launch_y_offset
-                        # Draw Flames
-                        flame_rect = pygame.Rect(rect.x + rect.width//4, draw_y + rect.height, rect.width//2, rect.height//2)
-                        import random
-                        f_color = random.choice([(255, 100, 0), (255, 200, 0), (255, 50, 0)])
-                        pygame.draw.ellipse(self.screen, f_color, flame_rect)
-
-                    if sprite:
-                         scaled = pygame.transform.scale(sprite, (int(size) + 1, int(size) + 1))
-                         self.screen.blit(scaled, (rect.x, draw_y))
-                    else:
-                        # Fallback for buildings without sprites
-                        pygame.draw.rect(self.screen, Building.get_color(building.type), (rect.x, draw_y, rect.width, rect.height))
+        # Terrain and static buildings come from pre-rendered chunks
+        if self.terrain_cache is None or self.terrain_cache.world is not self.world:
+            self.terrain_cache = TerrainCache(self.world, self.assets)
+        self.terrain_cache.draw(self.screen, self.camera, start_col, end_col, start_row, end_row)
 
-        for villager in self.entity_manager.villagers:
-            if villager.state == "WORKING":
+        size = TILE_SIZE * self.camera.zoom_level
+        for building in self.world.get_buildings("Rocket Ship"):
+            if not (start_col <= building.x < end_col and start_row <= building.y < end_row):
                 continue
+            screen_x, screen_y = self.camera.world_to_screen(building.x, building.y)
+            rect = pygame.Rect(int(screen_x), int(screen_y), int(size) + 1, int(size) + 1)
+            scaled = self.assets.get_scaled(building.type, int(size) + 1)
+            draw_y = rect.y
+            if building.is_launching:
+                draw_y -= building.launch_y_offset
+                # Draw Flames
+                flame_rect = pygame.Rect(rect.x + rect.width//4, draw_y + rect.height, rect.width//2, rect.height//2)
+                import random
+                f_color = random.choice([(255, 100, 0), (255, 200, 0), (255, 50, 0)])
+                pygame.draw.ellipse(self.screen, f_color, flame_rect)
+
+            if scaled:
+                 self.screen.blit(scaled, (rect.x, draw_y))
+            else:
+                # Fallback for buildings without sprites
+                pygame.draw.rect(self.screen, Building.get_color(building.type), (rect.x, draw_y, rect.width, rect.height))
 
-            screen_x, screen_y = self.camera.world_to_screen(villager.x, villager.y)
+        # Entities step at ENTITY_HZ; draw them in between their last two positions
+        alpha = self.tick_manager.entity_alpha()
+        size = TILE_SIZE * self.camera.zoom_level
+        v_size = size * 0.8
+        offset_x, offset_y = (size-v_size)/2, size-v_size
+        sprites = {} # job -> tinted sprite for this frame (from the Assets cache)
+        batch = [] # Submitted in one fblits call
+        for villager, vx, vy in self.entity_manager.visible_villagers(alpha):
+            screen_x, screen_y = self.camera.world_to_screen(vx, vy)
             
             # Safety Check: Infinite or NaN coordinates
             if not (math.isfinite(screen_x) and math.isfinite(screen_y)):
                 continue
 
-            size = TILE_SIZE * self.camera.zoom_level
-            v_size = size * 0.8
-            sprite = self.assets.get_sprite("villager")
+            job = villager.job
+            sprite = sprites.get(job)
+            if sprite is None:
+                # Shirt color based on job. The sprite is small, so the whole
+                # thing is tinted (BLEND_RGB_MULT); white leaves it as is.
+                sprite = sprites[job] = self.assets.get_tinted("villager", int(v_size), JOB_COLORS.get(job, WHITE))
             if sprite:
-                scaled = pygame.transform.scale(sprite, (int(v_size), int(v_size)))
-                
-                # Shirt color based on job
-                job_colors = {
-                    "Logging Workshop": (139, 69, 19), # Brown
-                    "Stone Refinery": (50, 50, 255),   # Blue
-                    "Blast Furnace": (128, 0, 128),    # Purple
-                    "Mine": (20, 20, 20),              # Black
-                    "Farm": (34, 139, 34)              # Green
-                }
-                color = job_colors.get(villager.job, (255, 255, 255)) # Default white
-                
-                # Create a colored version of the sprite (tinting the shirt area)
-                # Since the whole sprite is small, we tint the whole thing or just a part.
-                # For simplicity, we'll tint the whole sprite using BLEND_RGB_MULT
-                tinted = scaled.copy()
-                tinted.fill(color, special_flags=pygame.BLEND_RGB_MULT);
-                
-                dest = (int(screen_x + (size-v_size)/2), int(screen_y + (size-v_size)))
-                self.screen.blit(tinted, dest)
+                batch.append((sprite, (int(screen_x + offset_x), int(screen_y + offset_y))))
+        self.screen.fblits(batch)
 
         # Draw Trader
         trader = self.entity_manager.trader
         if trader.active:
-            screen_x, screen_y = self.camera.world_to_screen(trader.x, trader.y)
+            tx = trader.prev_x + (trader.x - trader.prev_x) * alpha
+            ty = trader.prev_y + (trader.y - trader.prev_y) * alpha
+            screen_x, screen_y = self.camera.world_to_screen(tx, ty)
             if math.isfinite(screen_x) and math.isfinite(screen_y):
                 size = TILE_SIZE * self.camera.zoom_level
-                ts = self.assets.get_sprite("trader")
-                if ts:
-                    scaled = pygame.transform.scale(ts, (int(size*2), int(size*2))) # Bigger balloon
+                scaled = self.assets.get_scaled("trader", int(size*2)) # Bigger balloon
+                if scaled:
                     self.screen.blit(scaled, (screen_x, screen_y))
 
         self.particle_manager.draw(self.screen, self.camera)
 
         # --- Dynamic Lighting ---
-        # Calculate darkness alpha: 0 (Day) -> 180 (Night)
-        time = self.tick_manager.current_time
-        max_alpha = 180
-        if time < 500: # Day
-            alpha = 0
-        elif time < 600: # Sunset
-            alpha = int(((time - 500) / 100) * max_alpha)
-        elif time < 1100: # Night
-            alpha = max_alpha
-        else: # Sunrise
-            alpha = int(((1200 - time) / 100) * max_alpha)
-            
+        alpha = self.tick_manager.get_darkness()
         if alpha > 0:
-            # Create the darkness overlay
-            lighting = pygame.Surface((self.screen.get_width(), self.screen.get_height()), pygame.SRCALPHA)
-            lighting.fill((0, 0, 20, alpha)) # Dark Blue tint
-            
-            # Cut 'glow' holes for light sources (Buildings)
-            for x in range(start_col, end_col):
-                for y in range(start_row, end_row):
-                    building = self.world.get_building_at(x, y)
-                    if building and building.type in ["House", "Blast Furnace", "Stone Refinery", "Laboratory"]:
-                        screen_x, screen_y = self.camera.world_to_screen(x, y)
-                        size = TILE_SIZE * self.camera.zoom_level
-                        center = (int(screen_x + size/2), int(screen_y + size/2))
-                        radius = int(size * 3)
-                        
-                        # Create a light mask for this specific building
-                        light_mask = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                        for r in range(radius, 0, -2):
-                            # Subtract alpha to make it look like light is cutting through
-                            pygame.draw.circle(light_mask, (0, 0, 0, 4), (radius, radius), r)
-                        
-                        lighting.blit(light_mask, (center[0]-radius, center[1]-radius), special_flags=pygame.BLEND_RGBA_SUB)
-
-            # Blit the final lighting overlay
-            self.screen.blit(lighting, (0, 0))
+            if self.lighting is None or self.lighting.world is not self.world:
+                self.lighting = Lighting(self.world)
+            self.lighting.draw(self.screen, self.camera, alpha)
 
         if not self.ui_manager.active_window:
             self.input_handler.draw_preview(self.screen)
@@ -438,7 +387,7 @@ class Game:
         # HUD Tooltips
         if self.hud.build_icon_rect.collidepoint(mx, my): tooltip = "Construction (B)"
         elif self.hud.jobs_icon_rect.collidepoint(mx, my): tooltip = "Worker Management"
-        elif self.hud.speed_btn_rect.collidepoint(mx, my): tooltip = "Toggle Speed (1x/10x)"
+        elif self.hud.speed_btn_rect.collidepoint(mx, my): tooltip = "Change Speed (" + "/".join(f"{s}x" for s in TIME_SCALES) + ")"
         elif self.hud.codex_icon_rect.collidepoint(mx, my): tooltip = "Item Codex"
         elif self.hud.code_btn_rect.collidepoint(mx, my): tooltip = "Redeem Codes"
         
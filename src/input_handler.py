@@ -40,14 +40,12 @@ class InputHandler:
         self.last_place_time = pygame.time.get_ticks() # Prevent instant placement
 
     def is_placement_valid(self, tx, ty):
-        target_tile = self.game.world.get_tile(tx, ty)
-        below_tile = self.game.world.get_tile(tx, ty + 1)
-        
-        if not target_tile or not below_tile:
+        world = self.game.world
+        if not world.in_bounds(tx, ty) or not world.in_bounds(tx, ty + 1):
             return False
 
         # Must be AIR at target
-        if target_tile.tile_type != "air":
+        if world.is_solid(tx, ty):
             return False
             
         # Space cannot be occupied by another building
@@ -56,7 +54,7 @@ class InputHandler:
 
         # Support check: Must be on solid ground (grass/dirt/stone) or a building
         has_support = False
-        if below_tile.tile_type != "air":
+        if world.is_solid(tx, ty + 1):
             has_support = True
         if self.game.world.get_building_at(tx, ty + 1):
             has_support = True
@@ -66,15 +64,7 @@ class InputHandler:
 
         # Blast Furnace proximity check: within 10 blocks of a stone refinery
         if self.selected_building_type == "Blast Furnace":
-            import math
-            near_refinery = False
-            for b in self.game.world.buildings.values():
-                if b.type == "Stone Refinery":
-                    dist = math.sqrt((tx - b.x)**2 + (ty - b.y)**2)
-                    if dist <= 10:
-                        near_refinery = True
-                        break
-            if not near_refinery:
+            if not self.game.world.is_near_refinery(tx, ty):
                 return False
 
         return True
@@ -114,10 +104,9 @@ class InputHandler:
             
             # Get Sprite from Assets
             assets = Assets.get()
-            sprite = assets.get_sprite(self.selected_building_type)
+            scaled = assets.get_scaled(self.selected_building_type, int(size))
             
-            if sprite:
-                scaled = pygame.transform.scale(sprite, (int(size), int(size)))
+            if scaled:
                 ghost = scaled.copy()
                 
                 # If invalid, tint red. Otherwise use white multiplier for transparency.
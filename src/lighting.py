@@ -0,0 +1,100 @@
+import math
+import pygame
+from collections import OrderedDict
+from .config import *
+
+class Lighting:
+    # Night overlay. Light from World.light_sources is drawn once into a
+    # world-space light map, in chunks of CHUNK_SIZE tiles, downsampled from
+    # world pixels by LIGHTMAP_DOWNSAMPLE. A chunk is only redrawn when a light
+    # within reach of it is placed or removed (World.dirty_light_chunks).
+    # Each frame the visible part of the map is subtracted from a darkness
+    # fill and smooth-scaled onto the screen.
+    PIXEL_BUDGET = 4 * 1024 * 1024 # Light map pixels kept cached (4 bytes each)
+
+    def __init__(self, world, downsample=LIGHTMAP_DOWNSAMPLE):
+        self.world = world
+        self.tile_px = max(1, TILE_SIZE // downsample) # Light map pixels across a tile
+        self.chunks = OrderedDict() # (chunk_x, chunk_y) -> Surface, or None where no light reaches
+        self.cached_pixels = 0
+        self.overlay = None # Darkness minus light, for the chunks in view
+        self.scaled = None # Visible part of the overlay at screen scale
+
+        # One light's mask, in light map pixels
+        radius = LIGHT_RADIUS * self.tile_px
+        self.mask = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        for r in range(radius, 0, -2):
+            pygame.draw.circle(self.mask, (0, 0, 0, 4), (radius, radius), r)
+
+    def invalidate(self, key):
+        surf = self.chunks.pop(key, None)
+        if surf:
+            self.cached_pixels -= surf.get_width() * surf.get_height()
+
+    def render_chunk(self, cx, cy):
+        x0, y0 = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+        lights = self.world.lights_in(x0 - LIGHT_RADIUS, y0 - LIGHT_RADIUS,
+                                      x0 + CHUNK_SIZE + LIGHT_RADIUS, y0 + CHUNK_SIZE + LIGHT_RADIUS)
+        if not lights:
+            return None
+        chunk_px = CHUNK_SIZE * self.tile_px
+        surf = pygame.Surface((chunk_px, chunk_px), pygame.SRCALPHA)
+        radius = self.mask.get_width() // 2
+        for b in lights:
+            # Overlapping lights add up, as the masks did when cut from the darkness one by one
+            px = int((b.x - x0 + 0.5) * self.tile_px) - radius
+            py = int((b.y - y0 + 0.5) * self.tile_px) - radius
+            surf.blit(self.mask, (px, py), special_flags=pygame.BLEND_RGBA_ADD)
+        return surf
+
+    def get_chunk(self, key):
+        if key in self.chunks:
+            self.chunks.move_to_end(key)
+            return self.chunks[key]
+        surf = self.render_chunk(*key)
+        self.chunks[key] = surf
+        if surf:
+            self.cached_pixels += surf.get_width() * surf.get_height()
+        return surf
+
+    def draw(self, screen, camera, alpha):
+        for key in self.world.dirty_light_chunks:
+            self.invalidate(key)
+        self.world.dirty_light_chunks.clear()
+
+        # Tiles in view, not clamped to the world: the darkness covers the whole screen
+        sw, sh = screen.get_size()
+        zoom = camera.zoom_level
+        col0 = math.floor(camera.offset_x / TILE_SIZE)
+        row0 = math.floor(camera.offset_y / TILE_SIZE)
+        col1 = math.ceil((camera.offset_x + sw / zoom) / TILE_SIZE)
+        row1 = math.ceil((camera.offset_y + sh / zoom) / TILE_SIZE)
+        cx0, cy0 = col0 // CHUNK_SIZE, row0 // CHUNK_SIZE
+        cx1, cy1 = (col1 - 1) // CHUNK_SIZE, (row1 - 1) // CHUNK_SIZE
+
+        chunk_px = CHUNK_SIZE * self.tile_px
+        size = ((cx1 - cx0 + 1) * chunk_px, (cy1 - cy0 + 1) * chunk_px)
+        if self.overlay is None or self.overlay.get_size() != size:
+            self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 20, alpha)) # Dark Blue tint
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                surf = self.get_chunk((cx, cy))
+                if surf:
+                    self.overlay.blit(surf, ((cx - cx0) * chunk_px, (cy - cy0) * chunk_px), special_flags=pygame.BLEND_RGBA_SUB)
+
+        # Crop to the tiles in view and scale those to the screen
+        view = self.overlay.subsurface(((col0 - cx0 * CHUNK_SIZE) * self.tile_px, (row0 - cy0 * CHUNK_SIZE) * self.tile_px,
+                                        (col1 - col0) * self.tile_px, (row1 - row0) * self.tile_px))
+        scaled_size = (int((col1 - col0) * TILE_SIZE * zoom) + 1, int((row1 - row0) * TILE_SIZE * zoom) + 1)
+        if self.scaled is None or self.scaled.get_size() != scaled_size:
+            self.scaled = pygame.Surface(scaled_size, pygame.SRCALPHA)
+        pygame.transform.smoothscale(view, scaled_size, self.scaled)
+        screen_x, screen_y = camera.world_to_screen(col0, row0)
+        screen.blit(self.scaled, (math.floor(screen_x), math.floor(screen_y)))
+
+        # LRU eviction, as in TerrainCache
+        while self.cached_pixels > self.PIXEL_BUDGET and len(self.chunks) > 1:
+            _, old = self.chunks.popitem(last=False)
+            if old:
+                self.cached_pixels -= old.get_width() * old.get_height()
@@ -1,47 +1,114 @@
 import pygame
 import random
+from .config import *
 
-class Particle:
-    def __init__(self, x, y, color, size, life):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = size
-        self.life = life
-        self.max_life = life
-        # Random velocity
-        self.vx = random.uniform(-0.5, 0.5)
-        self.vy = random.uniform(-0.5, -1.5) # Tend upwards
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.size = max(0, self.size - 0.05) # Shrink over time
-
-    def draw(self, screen, camera):
-        if self.life > 0:
-            screen_x, screen_y = camera.world_to_screen(self.x, self.y)
-            # Fade out alpha
-            alpha = int((self.life / self.max_life) * 255)
-            s = pygame.Surface((int(self.size * camera.zoom_level), int(self.size * camera.zoom_level)), pygame.SRCALPHA)
-            s.fill((*self.color, alpha))
-            screen.blit(s, (screen_x, screen_y))
+ALPHA_STEPS = 16 # Fade levels a particle sprite is pre-rendered at
 
 class ParticleManager:
-    def __init__(self):
-        self.particles = []
+    # Fixed-capacity struct-of-arrays pool. Columns are NumPy arrays when NumPy
+    # is installed, plain lists otherwise; live particles are rows [0, count).
+    # At most PARTICLE_EMIT_BUDGET particles are accepted per frame and at most
+    # PARTICLE_CAPACITY are alive, so a burst of emitters can't blow up a frame;
+    # anything past either limit is dropped.
+    COLUMNS = ("x", "y", "vx", "vy", "life", "max_life", "size", "color")
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, emit_budget=PARTICLE_EMIT_BUDGET):
+        self.capacity = capacity
+        self.emit_budget = emit_budget
+        self.emitted = 0 # Since the last update
+        self.count = 0
+        self.colors = [] # Palette, indexed by the color column
+        self.color_ids = {}
+        self.sprites = {} # (color id, pixel size, alpha step) -> Surface
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.int32 if name == "color" else np.float64) if np is not None else [0] * capacity)
 
     def spawn_particle(self, x, y, color, size=0.5, life=60):
-        p = Particle(x, y, color, size, life)
-        self.particles.append(p)
+        if self.emitted >= self.emit_budget or self.count >= self.capacity:
+            return
+        self.emitted += 1
+        if color not in self.color_ids:
+            self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        # Random velocity
+        self.vx[i] = random.uniform(-0.5, 0.5)
+        self.vy[i] = random.uniform(-0.5, -1.5) # Tend upwards
+        self.life[i] = life
+        self.max_life[i] = life
+        self.size[i] = size
+        self.color[i] = self.color_ids[color]
+        self.count += 1
 
     def update(self):
-        # Update and keep alive particles
-        for p in self.particles:
-            p.update()
-        self.particles = [p for p in self.particles if p.life > 0]
+        self.emitted = 0
+        n = self.count
+        if not n:
+            return
+        if np is not None:
+            self.x[:n] += self.vx[:n]
+            self.y[:n] += self.vy[:n]
+            self.life[:n] -= 1
+            self.size[:n] = np.maximum(0, self.size[:n] - 0.05) # Shrink over time
+            # Keep alive particles, packed at the front
+            alive = np.flatnonzero(self.life[:n] > 0)
+            if len(alive) < n:
+                for name in self.COLUMNS:
+                    col = getattr(self, name)
+                    col[:len(alive)] = col[alive]
+                self.count = len(alive)
+            return
+
+        kept = 0
+        for i in range(n):
+            life = self.life[i] - 1
+            if life <= 0:
+                continue
+            for name in self.COLUMNS:
+                col = getattr(self, name)
+                col[kept] = col[i]
+            self.x[kept] += self.vx[kept]
+            self.y[kept] += self.vy[kept]
+            self.life[kept] = life
+            self.size[kept] = max(0, self.size[kept] - 0.05)
+            kept += 1
+        self.count = kept
+
+    def get_sprite(self, color_id, px, step):
+        key = (color_id, px, step)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((px, px), pygame.SRCALPHA)
+            sprite.fill((*self.colors[color_id], min(255, (step + 1) * 256 // ALPHA_STEPS)))
+            self.sprites[key] = sprite
+        return sprite
 
     def draw(self, screen, camera):
-        for p in self.particles:
-            p.draw(screen, camera)
+        n = self.count
+        if not n:
+            return
+        zoom = camera.zoom_level
+        if np is not None:
+            xs = ((self.x[:n] * TILE_SIZE - camera.offset_x) * zoom).astype(np.int32).tolist()
+            ys = ((self.y[:n] * TILE_SIZE - camera.offset_y) * zoom).astype(np.int32).tolist()
+            sizes = (self.size[:n] * zoom).astype(np.int32).tolist()
+            # Fade out alpha, in ALPHA_STEPS levels
+            steps = (self.life[:n] / self.max_life[:n] * (ALPHA_STEPS - 1)).astype(np.int32).tolist()
+            colors = self.color[:n].tolist()
+        else:
+            xs = [int((x * TILE_SIZE - camera.offset_x) * zoom) for x in self.x[:n]]
+            ys = [int((y * TILE_SIZE - camera.offset_y) * zoom) for y in self.y[:n]]
+            sizes = [int(s * zoom) for s in self.size[:n]]
+            steps = [int(life / max_life * (ALPHA_STEPS - 1)) for life, max_life in zip(self.life[:n], self.max_life[:n])]
+            colors = self.color[:n]
+
+        batch = [(self.get_sprite(c, px, step), (x, y))
+                 for x, y, px, step, c in zip(xs, ys, sizes, steps, colors) if px > 0]
+        screen.fblits(batch)
@@ -0,0 +1,392 @@
+import random
+from itertools import compress
+from .config import *
+from .recipes import RECIPES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ProductionEngine:
+    def __init__(self, game, recipes=RECIPES):
+        self.game = game
+        self.recipes = recipes
+
+        # Compile every recipe into a handler once; run() just walks this list
+        self.handlers = [] # (building type, handler) in processing order
+        for b_type, recipe in recipes.items():
+            if any(line["inputs"] for line in recipe["lines"]) or "power" in recipe or recipe.get("toggle"):
+                handler = self.compile_converter(recipe)
+            else:
+                handler = self.compile_gatherer(recipe)
+            self.handlers.append((b_type, handler))
+
+        # Per-tick state shared by the handlers
+        self.world = None
+        self.rm = None
+        self.day = 1
+        self.happiness_bonus = 1.0
+
+    def begin_tick(self, day):
+        self.world = self.game.world
+        self.rm = self.game.resource_manager
+        self.day = day
+        self.happiness_bonus = 1.0 + (self.rm.happiness * 0.02)
+
+    def run(self, day):
+        self.begin_tick(day)
+        for b_type, handler in self.handlers:
+            buildings = self.world.get_buildings(b_type)
+            if buildings:
+                handler(buildings)
+        self.record_non_producers(day)
+
+    def record_non_producers(self, day):
+        # Houses report their population, other buildings without a recipe idle
+        for b_type, buildings in self.world.by_type.items():
+            if b_type == "House":
+                for b in buildings:
+                    b.record_production(b.villagers, day, overwrite=True)
+            elif b_type not in self.recipes:
+                for b in buildings:
+                    b.record_production(0, day)
+
+    def add_output(self, res, amount):
+        if res == "science":
+            self.rm.science_points += amount
+        else:
+            self.rm.inventory[res] += amount
+
+    def spawn_particles(self, building, particles):
+        if particles and hasattr(self.game, 'particle_manager'):
+            color, chance = particles
+            if random.random() < chance:
+                self.game.particle_manager.spawn_particle(building.x + 0.5, building.y, color)
+
+    def compile_gatherer(self, recipe):
+        # No inputs: every staffed building just adds to a per-type total
+        rate = recipe["rate"]
+        level_scaled = recipe["scaling"] == "worker_level"
+        use_food = recipe.get("food_efficiency", False)
+        reset_buffer = recipe.get("buffer") == "reset"
+        particles = recipe.get("particles")
+        outputs = [(res, amt) for line in recipe["lines"] for res, amt in line["outputs"].items()]
+
+        def produce_gathered(buildings):
+            world, day = self.world, self.day
+            multiplier = self.happiness_bonus
+            if use_food:
+                multiplier *= self.rm.food_efficiency
+
+            total = 0.0
+            for b in buildings:
+                workers = len(b.assigned_workers)
+                if workers == 0:
+                    b.record_production(0, day)
+                    continue
+                per_worker = (rate * b.level) / 3.0 if level_scaled else rate
+                produced = per_worker * workers * multiplier * world.get_warehouse_bonus(b)
+                total += produced
+                if reset_buffer:
+                    b.production_buffer = 0
+                self.spawn_particles(b, particles)
+                b.record_production(produced, day)
+
+            if total:
+                for res, amt in outputs:
+                    self.add_output(res, total * amt)
+        return produce_gathered
+
+    def compile_converter(self, recipe):
+        # Buildings draw on shared stock, so they're processed one after another
+        rate = recipe["rate"]
+        max_rate = recipe.get("max_rate")
+        use_food = recipe.get("food_efficiency", False)
+        add_buffer = recipe.get("buffer") == "add"
+        toggle = recipe.get("toggle", False)
+        power = list(recipe.get("power", {}).items())
+        particles = recipe.get("particles")
+        lines = [(list(line["inputs"].items()), list(line["outputs"].items()), line.get("mode", "partial"), line.get("tech"))
+                 for line in recipe["lines"]]
+
+        def produce_converted(buildings):
+            world, day, rm = self.world, self.day, self.rm
+            inventory = rm.inventory
+            multiplier = self.happiness_bonus
+            if use_food:
+                multiplier *= rm.food_efficiency
+            active_lines = [l for l in lines if l[3] is None or l[3] in rm.unlocked_techs]
+
+            for b in buildings:
+                workers = len(b.assigned_workers)
+                if workers == 0 or (toggle and not b.is_on):
+                    b.record_production(0, day)
+                    continue
+
+                if power:
+                    if any(inventory.get(res, 0) < amt for res, amt in power):
+                        b.record_production(0, day)
+                        continue
+                    for res, amt in power:
+                        inventory[res] -= amt
+
+                rate_min = rate * b.level
+                if max_rate is not None:
+                    rate_min = min(max_rate, rate_min)
+                efficiency = (workers / (3.0 * b.level)) * multiplier * world.get_warehouse_bonus(b)
+                actual_rate = (rate_min / 60.0) * efficiency
+
+                produced = 0
+                for inputs, outputs, mode, _ in active_lines:
+                    if mode == "all":
+                        if actual_rate <= 0 or any(inventory.get(res, 0) < amt * actual_rate for res, amt in inputs):
+                            continue
+                        made = actual_rate
+                    else:
+                        made = min([inventory.get(res, 0) / amt for res, amt in inputs] + [actual_rate])
+                        if made <= 0:
+                            continue
+                    for res, amt in inputs:
+                        inventory[res] -= made * amt
+                    for res, amt in outputs:
+                        self.add_output(res, made * amt)
+                    produced += made
+
+                if add_buffer:
+                    b.production_buffer += produced
+                self.spawn_particles(b, particles)
+                b.record_production(produced, day)
+        return produce_converted
+
+
+class VectorProductionEngine(ProductionEngine):
+    # Same recipes as ProductionEngine, but every building's level, worker count,
+    # ON flag and type ID live in parallel NumPy arrays grouped by type.
+    # Below `threshold` buildings the scalar path is cheaper and is used instead.
+    def __init__(self, game, recipes=RECIPES, threshold=VECTOR_PRODUCTION_THRESHOLD):
+        super().__init__(game, recipes)
+        self.threshold = threshold
+        self.type_ids = {b_type: i for i, b_type in enumerate(recipes)}
+        self.vector_handlers = []
+        for b_type, handler in self.handlers:
+            if handler.__name__ == "produce_gathered":
+                self.vector_handlers.append((b_type, self.compile_vector_gatherer(recipes[b_type])))
+            else:
+                self.vector_handlers.append((b_type, self.compile_vector_converter(recipes[b_type])))
+
+        self.synced_world = None
+        self.synced_layout = None
+        self.synced_staffing = None
+        self.order = [] # Buildings in array order
+        self.slices = {} # type -> (start, end) into the arrays
+
+    def run(self, day):
+        if len(self.game.world.buildings) < self.threshold:
+            return super().run(day)
+
+        self.begin_tick(day)
+        self.sync_arrays()
+        for b_type, handler in self.vector_handlers:
+            start, end = self.slices[b_type]
+            if end > start:
+                handler(start, end)
+        self.record_non_producers(day)
+
+    def sync_arrays(self):
+        world = self.world
+        if world is not self.synced_world or world.layout_version != self.synced_layout:
+            self.order = []
+            self.slices = {}
+            for b_type in self.recipes:
+                start = len(self.order)
+                self.order.extend(world.get_buildings(b_type))
+                self.slices[b_type] = (start, len(self.order))
+            n = len(self.order)
+            self.type_id = np.fromiter((self.type_ids[b.type] for b in self.order), dtype=np.int16, count=n)
+            self.level = np.fromiter((b.level for b in self.order), dtype=np.int64, count=n)
+            self.is_on = np.fromiter((b.is_on for b in self.order), dtype=bool, count=n)
+            self.synced_world = world
+            self.synced_layout = world.layout_version
+            self.synced_staffing = None
+
+        if world.staffing_version != self.synced_staffing:
+            n = len(self.order)
+            self.workers = np.fromiter((len(b.assigned_workers) for b in self.order), dtype=np.int64, count=n)
+            self.bonus = np.fromiter((world.get_warehouse_bonus(b) for b in self.order), dtype=np.float64, count=n)
+            self.synced_staffing = world.staffing_version
+
+    def write_back(self, start, end, produced, running, buffer_mode, particles):
+        day = self.day
+        buildings = self.order[start:end]
+        amounts = np.where(running, produced, 0.0).tolist()
+        active = list(compress(zip(buildings, amounts), running.tolist()))
+
+        if buffer_mode == "reset":
+            for b, _ in active:
+                b.production_buffer = 0
+        elif buffer_mode == "add":
+            for b, amount in active:
+                b.production_buffer += amount
+        if particles:
+            for b, _ in active:
+                self.spawn_particles(b, particles)
+
+        # Same as record_production, minus the call when no new day started
+        for b, amount in zip(buildings, amounts):
+            if b.last_day >= day:
+                b.production_history[-1] += amount
+            else:
+                b.record_production(amount, day)
+
+    def compile_vector_gatherer(self, recipe):
+        rate = recipe["rate"]
+        level_scaled = recipe["scaling"] == "worker_level"
+        use_food = recipe.get("food_efficiency", False)
+        buffer_mode = recipe.get("buffer")
+        particles = recipe.get("particles")
+        outputs = [(res, amt) for line in recipe["lines"] for res, amt in line["outputs"].items()]
+
+        def produce_gathered_vector(start, end):
+            multiplier = self.happiness_bonus
+            if use_food:
+                multiplier *= self.rm.food_efficiency
+
+            workers = self.workers[start:end]
+            per_worker = (rate * self.level[start:end]) / 3.0 if level_scaled else rate
+            produced = per_worker * workers * multiplier * self.bonus[start:end]
+            # Sequential sum, so totals match the scalar path exactly
+            total = float(np.cumsum(produced)[-1])
+
+            if total:
+                for res, amt in outputs:
+                    self.add_output(res, total * amt)
+            self.write_back(start, end, produced, workers > 0, buffer_mode, particles)
+        return produce_gathered_vector
+
+    def compile_vector_converter(self, recipe):
+        rate = recipe["rate"]
+        max_rate = recipe.get("max_rate")
+        use_food = recipe.get("food_efficiency", False)
+        buffer_mode = recipe.get("buffer")
+        toggle = recipe.get("toggle", False)
+        power = list(recipe.get("power", {}).items())
+        particles = recipe.get("particles")
+        lines = [(list(line["inputs"].items()), list(line["outputs"].items()), line.get("mode", "partial"), line.get("tech"))
+                 for line in recipe["lines"]]
+
+        def produce_converted_vector(start, end):
+            rm = self.rm
+            inventory = rm.inventory
+            multiplier = self.happiness_bonus
+            if use_food:
+                multiplier *= rm.food_efficiency
+            active_lines = [l for l in lines if l[3] is None or l[3] in rm.unlocked_techs]
+
+            level = self.level[start:end]
+            workers = self.workers[start:end]
+            running = workers > 0
+            if toggle:
+                running &= self.is_on[start:end]
+
+            if power:
+                # A building that can't be powered leaves the stock untouched,
+                # so the first `powered` running buildings (in order) get power
+                wanted = int(running.sum())
+                powered = wanted
+                for res, amt in power:
+                    stock = inventory.get(res, 0)
+                    n = min(wanted, max(0, int(stock // amt) + 1))
+                    while n > 0 and stock - (n - 1) * amt < amt:
+                        n -= 1
+                    powered = min(powered, n)
+                for res, amt in power:
+                    inventory[res] -= powered * amt
+                running &= np.cumsum(running) <= powered
+
+            rate_min = rate * level
+            if max_rate is not None:
+                rate_min = np.minimum(max_rate, rate_min)
+            efficiency = (workers / (3.0 * level)) * multiplier * self.bonus[start:end]
+            actual = np.where(running, (rate_min / 60.0) * efficiency, 0.0)
+
+            produced = np.zeros(end - start)
+            shared = set()
+            shares_inputs = False
+            for inputs, _, _, _ in active_lines:
+                for res, _ in inputs:
+                    shares_inputs = shares_inputs or res in shared
+                    shared.add(res)
+
+            if shares_inputs:
+                # Lines interleave per building on a common input; keep scalar order
+                for i in np.flatnonzero(running).tolist():
+                    produced[i] = self.run_lines_scalar(active_lines, float(actual[i]))
+            else:
+                for line in active_lines:
+                    produced += self.run_line_vector(line, actual)
+
+            self.write_back(start, end, produced, running, buffer_mode, particles)
+        return produce_converted_vector
+
+    def run_lines_scalar(self, active_lines, actual_rate):
+        inventory = self.rm.inventory
+        produced = 0
+        for inputs, outputs, mode, _ in active_lines:
+            if mode == "all":
+                if actual_rate <= 0 or any(inventory.get(res, 0) < amt * actual_rate for res, amt in inputs):
+                    continue
+                made = actual_rate
+            else:
+                made = min([inventory.get(res, 0) / amt for res, amt in inputs] + [actual_rate])
+                if made <= 0:
+                    continue
+            for res, amt in inputs:
+                inventory[res] -= made * amt
+            for res, amt in outputs:
+                self.add_output(res, made * amt)
+            produced += made
+        return produced
+
+    def run_line_vector(self, line, actual):
+        inputs, outputs, mode, _ = line
+        inventory = self.rm.inventory
+        made = np.zeros_like(actual)
+
+        if mode == "all":
+            # Greedy prefix: everyone is served until the first building whose
+            # batch doesn't fit; from there on stock is uneven, so finish in order
+            fits = actual > 0
+            first_fail = len(actual)
+            for res, amt in inputs:
+                need = np.cumsum(amt * actual)
+                over = np.flatnonzero((need > inventory.get(res, 0)) & fits)
+                if len(over):
+                    first_fail = min(first_fail, int(over[0]))
+            made[:first_fail] = actual[:first_fail]
+            total = float(made.sum())
+            for res, amt in inputs:
+                inventory[res] -= total * amt
+            for res, amt in outputs:
+                self.add_output(res, total * amt)
+            for i in range(first_fail, len(actual)):
+                rate_i = float(actual[i])
+                if rate_i <= 0 or any(inventory.get(res, 0) < amt * rate_i for res, amt in inputs):
+                    continue
+                made[i] = rate_i
+                for res, amt in inputs:
+                    inventory[res] -= amt * rate_i
+                for res, amt in outputs:
+                    self.add_output(res, amt * rate_i)
+        else:
+            # Everyone takes their full batch until the scarcest input runs dry
+            capacity = min(inventory.get(res, 0) / amt for res, amt in inputs)
+            before = np.cumsum(actual) - actual
+            made = np.clip(capacity - before, 0.0, actual)
+            total = float(made.sum())
+            if total > 0:
+                for res, amt in inputs:
+                    inventory[res] -= total * amt
+                for res, amt in outputs:
+                    self.add_output(res, total * amt)
+        return made
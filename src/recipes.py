@@ -0,0 +1,76 @@
+# Production Recipes
+# Processed in this order every tick: raw gatherers first, then the
+# converter chain (copper -> wiring -> batteries -> steel / parts).
+#
+# scaling:
+#   "worker_level" - each worker makes rate * level / 3 per second
+#   "worker"       - each worker makes rate per second
+#   "staffing"     - a full staff (3 per level) makes rate * level per minute,
+#                    optionally capped at max_rate per minute
+#
+# lines: each line turns `inputs` (per unit made) into `outputs` (per unit made).
+#   mode "all"     - the whole batch is made only if every input is in stock
+#   mode "partial" - makes as much as the scarcest input allows
+#   tech           - line only runs once this tech is unlocked
+#
+# power: resources consumed once per tick before a building may run.
+# toggle: building respects its ON/OFF switch.
+# buffer: "reset" zeroes production_buffer, "add" accumulates output in it.
+# particles: (color, chance per tick) for working buildings.
+
+RECIPES = {
+    "Logging Workshop": {
+        "scaling": "worker_level", "rate": 0.1, "food_efficiency": True, "buffer": "reset",
+        "lines": [{"inputs": {}, "outputs": {"wood": 1}}]
+    },
+    "Stone Refinery": {
+        "scaling": "worker_level", "rate": 0.1, "food_efficiency": True, "buffer": "reset",
+        "lines": [{"inputs": {}, "outputs": {"stone": 1}}],
+        "particles": ((150, 150, 150), 0.1)
+    },
+    "Mine": {
+        "scaling": "worker_level", "rate": 0.1, "food_efficiency": True, "buffer": "reset",
+        "lines": [{"inputs": {}, "outputs": {"iron": 1}}]
+    },
+    "Copper Mine": {
+        "scaling": "worker_level", "rate": 0.1, "food_efficiency": True, "buffer": "reset",
+        "lines": [{"inputs": {}, "outputs": {"copper": 1}}]
+    },
+    "Oxygenator": {
+        "scaling": "worker_level", "rate": 0.1, "food_efficiency": True, "buffer": "reset",
+        "lines": [{"inputs": {}, "outputs": {"oxygen": 1}}]
+    },
+    "Farm": {
+        "scaling": "worker_level", "rate": 500.0 / 1200, "food_efficiency": False,
+        "lines": [{"inputs": {}, "outputs": {"food": 1}}]
+    },
+    "Garden": {
+        "scaling": "worker_level", "rate": 500.0 / 1200, "food_efficiency": False,
+        "lines": [{"inputs": {}, "outputs": {"food": 1}}]
+    },
+    "Laboratory": {
+        "scaling": "worker", "rate": 0.2, "food_efficiency": False,
+        "lines": [{"inputs": {}, "outputs": {"science": 1}}],
+        "particles": ((100, 100, 255), 0.05)
+    },
+    "Advanced Machine Factory": {
+        "scaling": "staffing", "rate": 20, "food_efficiency": True, "buffer": "add", "toggle": True,
+        "lines": [{"inputs": {"copper": 5}, "outputs": {"wiring": 1}, "mode": "all"}]
+    },
+    "Power Plant": {
+        "scaling": "staffing", "rate": 30, "food_efficiency": True, "buffer": "add", "toggle": True,
+        "lines": [{"inputs": {"wiring": 15}, "outputs": {"batteries": 1}, "mode": "all"}]
+    },
+    "Blast Furnace": {
+        "scaling": "staffing", "rate": 20, "food_efficiency": True, "buffer": "add", "toggle": True,
+        "power": {"batteries": 15.0 / 60.0},
+        "lines": [{"inputs": {"wood": 1, "iron": 1}, "outputs": {"steel": 1}, "mode": "partial"}]
+    },
+    "Raw Material Factory": {
+        "scaling": "staffing", "rate": 20, "max_rate": 100, "food_efficiency": True, "buffer": "add",
+        "lines": [
+            {"inputs": {"stone": 1, "iron": 1}, "outputs": {"material_parts": 1}, "mode": "partial"},
+            {"inputs": {"copper": 1, "iron": 1}, "outputs": {"wiring": 1}, "mode": "partial", "tech": "Electronics"}
+        ]
+    }
+}
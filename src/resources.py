@@ -30,6 +30,7 @@ class ResourceManager:
             "Blast Furnace": -1,
             "Power Plant": -1
         }
+        self.job_targets_version = 0 # Bumped by set_job_target so jobs get rebalanced
         
         self.pinned_costs = [] # List of dicts e.g. [{"wood": 5}, {"stone": 5}]
         self.used_codes = []
@@ -74,8 +75,20 @@ class ResourceManager:
             return True
         return False
     
+    def set_job_target(self, job, target):
+        self.job_targets[job] = target
+        self.job_targets_version += 1
+
     def pin_cost(self, name, cost_dict):
         self.pinned_costs.append({"name": name, "cost": cost_dict})
     
     def unpin_cost(self, name):
-        self.pinned_costs = [p for p in self.pinned_costs if p["name"] != name]
\ No newline at end of file
+        self.pinned_costs = [p for p in self.pinned_costs if p["name"] != name]
+
+    def update_food_efficiency(self):
+        # Called once per in-game minute: production efficiency drops while
+        # out of food and slowly recovers to 1.0 while fed
+        if self.inventory.get("food", 0) <= 0:
+            self.food_efficiency = max(0.0, self.food_efficiency - 0.05)
+        else:
+            self.food_efficiency = min(1.0, self.food_efficiency + 0.05)
@@ -0,0 +1,213 @@
+import json
+import struct
+import zlib
+
+# Binary save format
+#
+#   MAGIC (4 bytes) | version (uint16) | zlib-compressed body
+#
+# The body is a run of sections, each `tag (4 bytes) | length (uint32) | payload`.
+# Readers skip tags they don't know, so sections can be added without breaking
+# older builds. All numbers are little-endian.
+#
+#   META - small JSON object: everything except buildings and villagers
+#   BLDG - building table, one packed array per field
+#   VILL - villager table, one packed array per field
+#
+# Table sections start with a uint32-length JSON header (row count and string
+# tables), followed by the column arrays in a fixed order.
+#
+# decode() returns the same dict layout as the JSON saves, so loading doesn't
+# care which format a save came from.
+#
+# Version history:
+#   1 - first binary format
+#   2 - building id column (BLDG) and workplace building id column (VILL),
+#       appended after the version 1 columns. A workplace of 0 means none and
+#       decodes to a villager with no "workplace" key, as in a JSON save that
+#       doesn't record one.
+
+MAGIC = b"MNRS"
+SAVE_VERSION = 2
+COMPRESSION_LEVEL = 6
+
+class SaveFormatError(Exception):
+    pass
+
+def is_binary(blob):
+    return blob[:len(MAGIC)] == MAGIC
+
+def pack_array(code, values):
+    return struct.pack(f"<{len(values)}{code}", *values)
+
+class Reader:
+    def __init__(self, blob):
+        self.blob = blob
+        self.pos = 0
+
+    def take(self, size):
+        chunk = self.blob[self.pos:self.pos + size]
+        if len(chunk) != size:
+            raise SaveFormatError("Save file is truncated")
+        self.pos += size
+        return chunk
+
+    def array(self, code, count):
+        fmt = f"<{count}{code}"
+        return list(struct.unpack(fmt, self.take(struct.calcsize(fmt))))
+
+    def header(self):
+        (size,) = struct.unpack("<I", self.take(4))
+        return json.loads(self.take(size))
+
+def pack_header(header):
+    raw = json.dumps(header).encode("utf-8")
+    return struct.pack("<I", len(raw)) + raw
+
+def encode_buildings(buildings):
+    types = []
+    type_ids = {}
+    resources = []
+    for b in buildings:
+        if b["type"] not in type_ids:
+            type_ids[b["type"]] = len(types)
+            types.append(b["type"])
+        for res in list(b.get("buffers", {})) + list(b.get("histories", {})):
+            if res not in resources:
+                resources.append(res)
+
+    parts = [pack_header({"count": len(buildings), "types": types, "resources": resources})]
+    parts.append(pack_array("i", [b["x"] for b in buildings]))
+    parts.append(pack_array("i", [b["y"] for b in buildings]))
+    parts.append(pack_array("H", [type_ids[b["type"]] for b in buildings]))
+    parts.append(pack_array("i", [int(b["level"]) for b in buildings]))
+    parts.append(pack_array("i", [int(b.get("villagers", 0)) for b in buildings]))
+    parts.append(pack_array("i", [int(b.get("last_day", 1)) for b in buildings]))
+    parts.append(pack_array("i", [int(b.get("target_workers", 0)) for b in buildings]))
+    parts.append(pack_array("B", [1 if b.get("is_on", True) else 0 for b in buildings]))
+    parts.append(pack_array("d", [b.get("buffer", 0) for b in buildings]))
+
+    # Variable-length lists are stored as a length column plus all values back to back
+    history = [b.get("production_history", [0]) for b in buildings]
+    parts.append(pack_array("H", [len(h) for h in history]))
+    parts.append(pack_array("d", [v for h in history for v in h]))
+    for res in resources:
+        parts.append(pack_array("d", [b.get("buffers", {}).get(res, 0) for b in buildings]))
+        res_history = [b.get("histories", {}).get(res, [0]) for b in buildings]
+        parts.append(pack_array("H", [len(h) for h in res_history]))
+        parts.append(pack_array("d", [v for h in res_history for v in h]))
+    parts.append(pack_array("I", [b.get("id") or 0 for b in buildings]))
+    return b"".join(parts)
+
+def split_lists(lengths, values):
+    lists = []
+    pos = 0
+    for n in lengths:
+        lists.append(values[pos:pos + n])
+        pos += n
+    return lists
+
+def decode_buildings(payload, version):
+    r = Reader(payload)
+    header = r.header()
+    n = header["count"]
+    types = header["types"]
+    xs, ys = r.array("i", n), r.array("i", n)
+    type_ids = r.array("H", n)
+    levels, villagers = r.array("i", n), r.array("i", n)
+    last_days, target_workers = r.array("i", n), r.array("i", n)
+    is_on = r.array("B", n)
+    buffer = r.array("d", n)
+    lengths = r.array("H", n)
+    history = split_lists(lengths, r.array("d", sum(lengths)))
+
+    buffers = [{} for _ in range(n)]
+    histories = [{} for _ in range(n)]
+    for res in header["resources"]:
+        for i, value in enumerate(r.array("d", n)):
+            buffers[i][res] = value
+        lengths = r.array("H", n)
+        for i, h in enumerate(split_lists(lengths, r.array("d", sum(lengths)))):
+            histories[i][res] = h
+    ids = r.array("I", n) if version >= 2 else [0] * n
+
+    return [{
+        "id": ids[i] or None,
+        "x": xs[i], "y": ys[i], "type": types[type_ids[i]],
+        "level": levels[i],
+        "villagers": villagers[i],
+        "buffer": buffer[i],
+        "production_history": history[i],
+        "last_day": last_days[i],
+        "target_workers": target_workers[i],
+        "buffers": buffers[i],
+        "histories": histories[i],
+        "is_on": bool(is_on[i])
+    } for i in range(n)]
+
+def encode_villagers(villagers):
+    jobs = []
+    job_ids = {}
+    for v in villagers:
+        if v["job"] not in job_ids:
+            job_ids[v["job"]] = len(jobs)
+            jobs.append(v["job"])
+    parts = [pack_header({"count": len(villagers), "jobs": jobs})]
+    parts.append(pack_array("d", [v["x"] for v in villagers]))
+    parts.append(pack_array("d", [v["y"] for v in villagers]))
+    parts.append(pack_array("H", [job_ids[v["job"]] for v in villagers]))
+    parts.append(pack_array("I", [v.get("workplace", 0) for v in villagers]))
+    return b"".join(parts)
+
+def decode_villagers(payload, version):
+    r = Reader(payload)
+    header = r.header()
+    n = header["count"]
+    jobs = header["jobs"]
+    xs, ys = r.array("d", n), r.array("d", n)
+    job_ids = r.array("H", n)
+    if version < 2:
+        # No workplaces saved; the loader falls back to relinking by job
+        return [{"x": xs[i], "y": ys[i], "job": jobs[job_ids[i]]} for i in range(n)]
+    workplaces = r.array("I", n)
+    villagers = []
+    for i in range(n):
+        v = {"x": xs[i], "y": ys[i], "job": jobs[job_ids[i]]}
+        if workplaces[i]:
+            v["workplace"] = workplaces[i]
+        villagers.append(v)
+    return villagers
+
+def encode(data):
+    meta = {k: v for k, v in data.items() if k not in ("buildings", "villagers")}
+    sections = [
+        (b"META", json.dumps(meta).encode("utf-8")),
+        (b"BLDG", encode_buildings(data.get("buildings", []))),
+        (b"VILL", encode_villagers(data.get("villagers", [])))
+    ]
+    body = b"".join(struct.pack("<4sI", tag, len(payload)) + payload for tag, payload in sections)
+    return MAGIC + struct.pack("<H", SAVE_VERSION) + zlib.compress(body, COMPRESSION_LEVEL)
+
+def decode(blob):
+    if not is_binary(blob):
+        raise SaveFormatError("Not a binary save")
+    (version,) = struct.unpack("<H", blob[len(MAGIC):len(MAGIC) + 2])
+    if version > SAVE_VERSION:
+        raise SaveFormatError(f"Save version {version} is newer than this game supports ({SAVE_VERSION})")
+    try:
+        body = zlib.decompress(blob[len(MAGIC) + 2:])
+    except zlib.error as e:
+        raise SaveFormatError(f"Save file is corrupt: {e}")
+
+    sections = {}
+    r = Reader(body)
+    while r.pos < len(body):
+        tag, size = struct.unpack("<4sI", r.take(8))
+        sections[tag] = r.take(size)
+
+    if b"META" not in sections:
+        raise SaveFormatError("Save file has no META section")
+    data = json.loads(sections[b"META"])
+    data["buildings"] = decode_buildings(sections[b"BLDG"], version) if b"BLDG" in sections else []
+    data["villagers"] = decode_villagers(sections[b"VILL"], version) if b"VILL" in sections else []
+    return data
@@ -0,0 +1,178 @@
+import json
+import os
+import struct
+import zlib
+
+# Save journal
+#
+# An append-only file next to a save snapshot (data/<name>.journal) holding
+# what changed since the snapshot, one record per autosave:
+#
+#   MAGIC (4 bytes) | version (uint16) | journal id (32 bytes)
+#   record: length (uint32) | crc32 (uint32) | zlib-compressed JSON delta
+#
+# The journal id matches "journal_id" in the snapshot it belongs to. Writing a
+# new snapshot gives it a new id, so a leftover journal from before (e.g. a
+# crash between writing the snapshot and deleting the old journal) is ignored.
+# A record cut short by a crash fails its length or CRC check; it and anything
+# after it are dropped on replay.
+#
+# A delta holds:
+#   meta      - top-level values that changed (inventory, time, techs, ...)
+#   buildings - ids removed, the full record of each building added, and for
+#               each changed building its id plus just the fields that changed
+#               (for buffers/histories, just the resources that changed).
+#               Production histories are rolling windows where usually only the
+#               last day moved, so they're stored as [drop, keep, tail]: drop
+#               values off the front of the old list, keep the next `keep`,
+#               then append tail.
+#   villagers - new row count, changed rows [i, x, y, job, workplace] and
+#               added rows [x, y, job, workplace]
+#
+# Villagers are diffed on job and workplace only. Positions change every step
+# and are cosmetic, so villagers whose row didn't otherwise change come back
+# where the snapshot left them.
+
+MAGIC = b"MNRJ"
+JOURNAL_VERSION = 1
+ID_SIZE = 32 # uuid4 hex
+HEADER_SIZE = len(MAGIC) + 2 + ID_SIZE
+RECORD_HEADER = struct.Struct("<II")
+
+def pack_header(journal_id):
+    return MAGIC + struct.pack("<H", JOURNAL_VERSION) + journal_id.encode("ascii")
+
+def pack_record(delta):
+    payload = zlib.compress(json.dumps(delta).encode("utf-8"))
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def read_records(blob, journal_id):
+    # Returns (deltas, length of the valid part of the journal)
+    if len(blob) < HEADER_SIZE or blob[:len(MAGIC)] != MAGIC:
+        return [], 0
+    (version,) = struct.unpack("<H", blob[len(MAGIC):len(MAGIC) + 2])
+    if version > JOURNAL_VERSION or blob[len(MAGIC) + 2:HEADER_SIZE] != journal_id.encode("ascii"):
+        return [], 0
+
+    deltas = []
+    pos = HEADER_SIZE
+    while pos + RECORD_HEADER.size <= len(blob):
+        size, crc = RECORD_HEADER.unpack_from(blob, pos)
+        payload = blob[pos + RECORD_HEADER.size:pos + RECORD_HEADER.size + size]
+        if len(payload) != size or zlib.crc32(payload) != crc:
+            break
+        deltas.append(json.loads(zlib.decompress(payload)))
+        pos += RECORD_HEADER.size + size
+    return deltas, pos
+
+def replay(data, path):
+    # Applies the journal at path to the save data it belongs to, in place.
+    # Returns the length of the journal's valid part (0 if there's none to apply).
+    journal_id = data.get("journal_id")
+    if journal_id is None or not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        deltas, size = read_records(f.read(), journal_id)
+    for delta in deltas:
+        apply(data, delta)
+    return size
+
+NESTED_FIELDS = ("buffers", "histories")
+HISTORY_FIELDS = ("production_history", "histories")
+
+def history_delta(old, new):
+    best = (0, 0)
+    for drop in range(len(old) + 1):
+        keep = 0
+        while drop + keep < len(old) and keep < len(new) and old[drop + keep] == new[keep]:
+            keep += 1
+        if keep > best[1]:
+            best = (drop, keep)
+    drop, keep = best
+    return [drop, keep, new[keep:]]
+
+def apply_history(old, delta):
+    drop, keep, tail = delta
+    return old[drop:drop + keep] + tail
+
+def building_changes(old, new):
+    changes = {}
+    for k, v in new.items():
+        old_v = old.get(k)
+        if old_v == v:
+            continue
+        if k in NESTED_FIELDS and isinstance(old_v, dict):
+            v = {res: value for res, value in v.items() if old_v.get(res) != value}
+            if k in HISTORY_FIELDS:
+                v = {res: history_delta(old_v.get(res, []), h) for res, h in v.items()}
+        elif k in HISTORY_FIELDS:
+            v = history_delta(old_v or [], v)
+        changes[k] = v
+    return changes
+
+def villager_row(v):
+    return v["job"], v.get("workplace", 0)
+
+def diff(base, data):
+    # Delta that turns base into data (see above). Both are save-data dicts.
+    meta = {k: v for k, v in data.items()
+            if k not in ("buildings", "villagers") and base.get(k) != v}
+
+    old_buildings = {b["id"]: b for b in base["buildings"]}
+    new_ids = set()
+    added = []
+    changed = []
+    for b in data["buildings"]:
+        new_ids.add(b["id"])
+        old = old_buildings.get(b["id"])
+        if old is None:
+            added.append(b)
+        elif old != b:
+            changes = building_changes(old, b)
+            changes["id"] = b["id"]
+            changed.append(changes)
+    removed = [i for i in old_buildings if i not in new_ids]
+
+    old_villagers = base["villagers"]
+    new_villagers = data["villagers"]
+    shared = min(len(old_villagers), len(new_villagers))
+    changed_rows = [[i, v["x"], v["y"], v["job"], v.get("workplace", 0)]
+                    for i, (old, v) in enumerate(zip(old_villagers[:shared], new_villagers))
+                    if villager_row(old) != villager_row(v)]
+    added_rows = [[v["x"], v["y"], v["job"], v.get("workplace", 0)] for v in new_villagers[shared:]]
+
+    return {
+        "meta": meta,
+        "buildings": {"removed": removed, "added": added, "changed": changed},
+        "villagers": {"count": len(new_villagers), "changed": changed_rows, "added": added_rows}
+    }
+
+def apply(data, delta):
+    # Replays one delta onto save data in place
+    data.update(delta["meta"])
+
+    buildings = {b.get("id"): b for b in data["buildings"]}
+    for i in delta["buildings"]["removed"]:
+        buildings.pop(i, None)
+    for b in delta["buildings"]["added"]:
+        buildings[b["id"]] = b # On the end, like World.add_building
+    for changes in delta["buildings"]["changed"]:
+        b = buildings[changes["id"]]
+        for k, v in changes.items():
+            if k in NESTED_FIELDS and isinstance(b.get(k), dict):
+                if k in HISTORY_FIELDS:
+                    v = {res: apply_history(b[k].get(res, []), h) for res, h in v.items()}
+                b[k].update(v)
+            elif k in HISTORY_FIELDS:
+                b[k] = apply_history(b.get(k) or [], v)
+            else:
+                b[k] = v
+    data["buildings"] = list(buildings.values())
+
+    villagers = data["villagers"]
+    rows = delta["villagers"]
+    del villagers[rows["count"]:]
+    for i, x, y, job, workplace in rows["changed"]:
+        villagers[i] = {"x": x, "y": y, "job": job, "workplace": workplace}
+    for x, y, job, workplace in rows["added"]:
+        villagers.append({"x": x, "y": y, "job": job, "workplace": workplace})
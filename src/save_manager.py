@@ -1,23 +1,60 @@
+import gc
 import json
 import os
+import threading
+import time
+import uuid
 from .world import Building, Tile
 from .config import *
+from . import save_format
+from . import save_journal
 
 class SaveManager:
     def __init__(self, game):
         self.game = game
         self.save_dir = "data"
+        self.save_format = SAVE_FORMAT
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
+        
+        # Background autosave
+        self.save_thread = None
+        self.autosave_pending = False # Autosave requested while one was in flight
+        self.last_snapshot_ms = 0.0 # Main-thread cost of the last autosave
+        self.last_autosave_bytes = 0 # Bytes written by the last autosave
+        
+        # Journal: autosaves append what changed since the last full save
+        # (see save_journal.py). journal_base is the data the journal currently
+        # brings the save up to; only the thread doing the writing touches it.
+        self.journal_world = None # World the journal belongs to
+        self.journal_id = None
+        self.journal_base = None
+        self.journal_size = 0 # Valid bytes in the journal file
+        
+        # Save index: world name -> summary (day, population, ...), so the load
+        # screen never has to open the saves themselves
+        self.index = None # Loaded on first use
+        self.index_lock = threading.Lock() # Background saves update it too
 
-    def get_save_path(self, world_name):
-        return os.path.join(self.save_dir, f"{world_name}.json")
+    def get_save_path(self, world_name, ext=None):
+        if ext is None:
+            ext = ".json" if self.save_format == "json" else SAVE_EXT
+        return os.path.join(self.save_dir, f"{world_name}{ext}")
 
-    def save_game(self):
-        if not self.game.world_name:
-            return
-            
-        data = {
+    def find_save(self, world_name):
+        # A world can have both a binary and a JSON save (an older save, or one
+        # written with the other SAVE_FORMAT); the newer one wins, binary on a tie
+        paths = [self.get_save_path(world_name, ext) for ext in (SAVE_EXT, ".json")]
+        return max((p for p in paths if os.path.exists(p)), key=os.path.getmtime, default=None)
+
+    def snapshot(self):
+        # Copy of the game for a save, taken on the main thread. Only flat data
+        # is copied here (a tuple per building, the villager store columns);
+        # save_data builds the save dicts from it, on the save thread for
+        # autosaves. Nothing in it is shared with live objects, except the
+        # villagers' workplaces, which are only read for their (fixed) ids.
+        rm = self.game.resource_manager
+        meta = {
             "world_name": self.game.world_name,
             "world_width": self.game.world.width,
             "completed": self.game.is_completed,
@@ -25,56 +62,263 @@ class SaveManager:
             "day_counter": self.game.tick_manager.day_counter,
             "food_efficiency": self.game.resource_manager.food_efficiency,
             "happiness": self.game.resource_manager.happiness,
-            "inventory": self.game.resource_manager.inventory,
-            "pinned": self.game.resource_manager.pinned_costs,
-            "used_codes": self.game.resource_manager.used_codes,
-            "science_points": self.game.resource_manager.science_points,
-            "unlocked_techs": self.game.resource_manager.unlocked_techs,
-            "job_targets": self.game.resource_manager.job_targets,
+            "inventory": dict(rm.inventory),
+            "pinned": [{"name": p["name"], "cost": dict(p["cost"])} for p in rm.pinned_costs],
+            "used_codes": list(rm.used_codes),
+            "science_points": rm.science_points,
+            "unlocked_techs": list(rm.unlocked_techs),
+            "job_targets": dict(rm.job_targets),
             "camera": {
                 "x": self.game.camera.offset_x,
                 "y": self.game.camera.offset_y,
                 "zoom": self.game.camera.zoom_level
-            },
-            "buildings": []
+            }
         }
         
-        for (x, y), b in self.game.world.buildings.items():
-            b_data = {
-                "x": x, "y": y, "type": b.type,
-                "level": b.level,
-                "villagers": b.villagers,
-                "buffer": b.production_buffer,
-                "production_history": b.production_history,
-                "last_day": b.last_day,
-                "target_workers": b.target_workers,
-                "buffers": b.buffers,
-                "histories": b.histories,
-                "is_on": b.is_on
-            }
-            data["buildings"].append(b_data)
+        # Allocating tens of thousands of small tuples would set off the cyclic
+        # GC several times over; none of them can form a cycle, so hold it off
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            buildings = [(b.id, b.x, b.y, b.type, b.level, b.villagers, b.production_buffer,
+                          tuple(b.production_history), b.last_day, b.target_workers,
+                          tuple(b.buffers.items()), tuple(b.histories), tuple(map(tuple, b.histories.values())), b.is_on)
+                         for b in self.game.world.buildings.values()]
+            store = self.game.entity_manager.store
+            villagers = (store.column_copy("x"), store.column_copy("y"), store.column_copy("job"),
+                         list(store.job_names), list(store.workplaces))
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return meta, buildings, villagers
+
+    def save_data(self, snapshot):
+        # Plain save data (the JSON layout) from a snapshot
+        meta, buildings, villagers = snapshot
+        data = dict(meta)
+        data["buildings"] = [{
+            "id": b_id,
+            "x": x, "y": y, "type": b_type,
+            "level": level,
+            "villagers": villager_count,
+            "buffer": buffer,
+            "production_history": list(history),
+            "last_day": last_day,
+            "target_workers": target_workers,
+            "buffers": dict(buffers),
+            "histories": {res: list(h) for res, h in zip(resources, histories)},
+            "is_on": is_on
+        } for (b_id, x, y, b_type, level, villager_count, buffer, history, last_day, target_workers,
+               buffers, resources, histories, is_on) in buildings]
+        
+        # workplace is the building id, 0 for none
+        xs, ys, jobs, job_names, workplaces = villagers
+        as_list = self.game.entity_manager.store.as_list
+        data["villagers"] = [{"x": x, "y": y, "job": job_names[job], "workplace": b.id if b is not None else 0}
+                             for x, y, job, b in zip(as_list(xs), as_list(ys), as_list(jobs), workplaces)]
+        return data
+
+    def build_save_data(self):
+        return self.save_data(self.snapshot())
+
+    def write_save_file(self, path, data):
+        # Write to a temp file and rename it over the old save, so a crash
+        # mid-write never leaves a half-written save behind
+        if path.endswith(".json"):
+            blob = json.dumps(data).encode("utf-8")
+        else:
+            blob = save_format.encode(data)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def summarize(self, data):
+        # The load screen's view of a save
+        width = data.get("world_width", 150)
+        size = next((name for name, w in WORLD_SIZES.items() if w == width), f"{width} wide")
+        return {
+            "day": data.get("day_counter", 1),
+            "population": len(data.get("villagers", [])),
+            "buildings": len(data.get("buildings", [])),
+            "completed": data.get("completed", False),
+            "size": size
+        }
+
+    def get_index_path(self):
+        return os.path.join(self.save_dir, SAVE_INDEX)
+
+    def load_index(self):
+        if self.index is None:
+            try:
+                with open(self.get_index_path()) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+        return self.index
+
+    def update_index(self, world_name, summary):
+        # summary=None drops the world
+        with self.index_lock:
+            index = self.load_index()
+            if summary is None:
+                if index.pop(world_name, None) is None:
+                    return
+            else:
+                index[world_name] = summary
+            try:
+                self.write_save_file(self.get_index_path(), index)
+            except Exception as e:
+                print(f"Failed to update save index: {e}")
+
+    def get_journal_path(self, world_name):
+        return os.path.join(self.save_dir, f"{world_name}{JOURNAL_EXT}")
+
+    def read_world(self, world_name, path):
+        # Full save with its journal replayed on top.
+        # Returns (data, valid bytes in the journal).
+        data = self.read_save_file(path)
+        return data, save_journal.replay(data, self.get_journal_path(world_name))
+
+    def read_save_file(self, path):
+        with open(path, "rb") as f:
+            blob = f.read()
+        if save_format.is_binary(blob):
+            return save_format.decode(blob)
+        return json.loads(blob)
+
+    def save_game(self):
+        if not self.game.world_name:
+            return
             
-        villagers = []
-        for v in self.game.entity_manager.villagers:
-            villagers.append({"x": v.x, "y": v.y, "job": v.job})
-        data["villagers"] = villagers
+        self.wait_for_save()
+        self.journal_world = self.game.world
+        self.write_save(self.game.world_name, self.get_save_path(self.game.world_name), self.build_save_data())
 
-        path = self.get_save_path(self.game.world_name)
+    def write_save(self, world_name, path, data):
+        # Full save. Starts a new journal: the old one no longer matches.
         try:
-            with open(path, "w") as f:
-                json.dump(data, f)
-            print(f"Game Saved: {self.game.world_name}")
+            data["journal_id"] = uuid.uuid4().hex
+            self.write_save_file(path, data)
+            self.journal_id = data["journal_id"]
+            self.journal_base = data
+            self.journal_size = 0
+            journal_path = self.get_journal_path(world_name)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            self.last_autosave_bytes = os.path.getsize(path)
+            self.index_save(world_name, path, data)
+            print(f"Game Saved: {world_name}")
         except Exception as e:
+            self.journal_base = None # Unknown state on disk, next autosave writes in full
             print(f"Save Failed: {e}")
 
-    def load_game(self, world_name):
+    def append_journal(self, world_name, path, data):
+        # Autosave as a journal record, or a full save when there's nothing to
+        # append to yet or the journal has grown past JOURNAL_COMPACT_BYTES
+        if self.journal_base is None or self.journal_size > JOURNAL_COMPACT_BYTES or not os.path.exists(path):
+            self.write_save(world_name, path, data)
+            return
+        try:
+            record = save_journal.pack_record(save_journal.diff(self.journal_base, data))
+            journal_path = self.get_journal_path(world_name)
+            if self.journal_size == 0:
+                record = save_journal.pack_header(self.journal_id) + record
+            # Write at the end of the valid part, cutting off any torn record left by a crash
+            with open(journal_path, "r+b" if os.path.exists(journal_path) else "wb") as f:
+                f.seek(self.journal_size)
+                f.write(record)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_size += len(record)
+            self.journal_base = data
+            self.last_autosave_bytes = len(record)
+            self.index_save(world_name, path, data)
+            print(f"Game Saved: {world_name} (journal +{len(record)} bytes)")
+        except Exception as e:
+            self.journal_base = None
+            print(f"Save Failed: {e}")
+
+    def index_save(self, world_name, path, data):
+        summary = self.summarize(data)
+        summary["saved_at"] = time.time()
+        summary["mtime"] = os.path.getmtime(path)
+        self.update_index(world_name, summary)
+
+    def autosave(self):
+        # Snapshot on the main thread; build the save data, serialize and write
+        # it on a worker thread.
+        # Requests made while a save is still being written are coalesced into
+        # one follow-up save (see update).
+        if not self.game.world_name:
+            return
+        if self.is_saving():
+            self.autosave_pending = True
+            return
+        
+        start = time.perf_counter()
+        snapshot = self.snapshot()
+        self.last_snapshot_ms = (time.perf_counter() - start) * 1000
+        
+        world_name = self.game.world_name
         path = self.get_save_path(world_name)
-        if not os.path.exists(path):
+        if self.journal_world is not self.game.world:
+            # New game: nothing on disk the journal could build on
+            self.journal_world = self.game.world
+            self.journal_base = None
+        self.save_thread = threading.Thread(target=self.write_autosave, args=(world_name, path, snapshot), daemon=True)
+        self.save_thread.start()
+        print(f"Auto-saving game... (snapshot took {self.last_snapshot_ms:.1f} ms)")
+
+    def write_autosave(self, world_name, path, snapshot):
+        # Save thread
+        self.append_journal(world_name, path, self.save_data(snapshot))
+
+    def update(self):
+        if self.autosave_pending and not self.is_saving():
+            self.autosave_pending = False
+            self.autosave()
+
+    def is_saving(self):
+        return self.save_thread is not None and self.save_thread.is_alive()
+
+    def wait_for_save(self):
+        # Blocking saves, loads and deletes must not race a background write
+        if self.save_thread is not None:
+            self.save_thread.join()
+            self.save_thread = None
+
+    def export_json(self, world_name, path=None):
+        # Human-readable copy of a save, e.g. for debugging or modding
+        src = self.find_save(world_name)
+        if src is None:
+            print(f"Export Failed: no save named {world_name}")
+            return None
+        if path is None:
+            path = os.path.join(self.save_dir, "exports", f"{world_name}.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data, _ = self.read_world(world_name, src)
+            data.pop("journal_id", None)
+            self.write_save_file(path, data)
+            print(f"Exported {world_name} to {path}")
+            return path
+        except Exception as e:
+            print(f"Export Failed: {e}")
+            return None
+
+    def load_game(self, world_name):
+        self.wait_for_save()
+        self.autosave_pending = False
+        path = self.find_save(world_name)
+        if path is None:
             return False
             
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
+            data, journal_size = self.read_world(world_name, path)
             
             # Reset managers to ensure fresh state
             self.game.resource_manager = None
@@ -117,9 +361,11 @@ class SaveManager:
             self.game.camera.offset_y = cam["y"]
             self.game.camera.zoom_level = cam["zoom"]
             
-            self.game.world.buildings = {}
+            world = self.game.world
+            by_id = {}
             for b_data in data["buildings"]:
                 b = Building(b_data["x"], b_data["y"], b_data["type"])
+                b.id = b_data.get("id")
                 b.level = b_data["level"]
                 b.villagers = b_data.get("villagers", 0)
                 b.production_buffer = b_data.get("buffer", 0)
@@ -129,22 +375,32 @@ class SaveManager:
                 b.buffers = b_data.get("buffers", b.buffers)
                 b.histories = b_data.get("histories", b.histories)
                 b.is_on = b_data.get("is_on", True)
-                self.game.world.buildings[(b_data["x"], b_data["y"])] = b
+                world.add_building(b)
+                by_id[b.id] = b
                 
-            self.game.entity_manager.villagers = []
-            for v_data in data.get("villagers", []):
-                v = self.game.entity_manager.spawn_villager(v_data["x"], v_data["y"], v_data.get("job", "Unemployed"))
+            self.game.entity_manager.clear()
+            villager_data = data.get("villagers", [])
+            villagers = self.game.entity_manager.spawn_villagers(
+                [v["x"] for v in villager_data], [v["y"] for v in villager_data],
+                [v.get("job", "Unemployed") for v in villager_data])
+            
+            # Re-link each villager to the building they were saved at. Those
+            # without one (older saves, or a building id that isn't there) get
+            # placed by job instead.
+            unlinked = []
+            for v, v_data in zip(villagers, villager_data):
+                workplace = by_id.get(v_data.get("workplace"))
+                if workplace is not None:
+                    world.assign_worker(workplace, v)
+                else:
+                    unlinked.append(v)
+            self.relink_by_job(unlinked)
                 
-                # Re-link assignment based on job
-                if v.job != "Unemployed" and v.job != "House":
-                    target_type = v.job
-                    possible_buildings = [b for b in self.game.world.buildings.values() 
-                                         if (b.type == target_type or (target_type == "Farm" and b.type == "Garden"))
-                                         and len(b.assigned_workers) < 3 * b.level]
-                    if possible_buildings:
-                        workplace = possible_buildings[0]
-                        v.assigned_building = workplace
-                        workplace.assigned_workers.append(v)
+            # Later autosaves carry on the journal from here
+            self.journal_world = self.game.world
+            self.journal_id = data.get("journal_id")
+            self.journal_base = self.build_save_data() if self.journal_id else None
+            self.journal_size = journal_size
                 
             print(f"Game Loaded: {world_name}")
             return True
@@ -154,20 +410,88 @@ class SaveManager:
             traceback.print_exc()
             return False
 
+    def relink_by_job(self, villagers):
+        # Give each worker the first building of their job with a free slot, as
+        # saves without workplaces were always loaded. Anyone left without one
+        # goes back to the unemployed pool for balance_jobs to hire again.
+        world = self.game.world
+        open_slots = {}
+        for b in world.buildings.values():
+            open_slots.setdefault(b.type, []).append(b)
+            if b.type == "Garden": # Farmers work gardens too
+                open_slots.setdefault("Farm", []).append(b)
+        cursors = {}
+        for v in villagers:
+            job = v.job
+            if job == "Unemployed" or job == "House":
+                continue
+            candidates = open_slots.get(job, [])
+            i = cursors.get(job, 0)
+            while i < len(candidates) and len(candidates[i].assigned_workers) >= 3 * candidates[i].level:
+                i += 1
+            cursors[job] = i
+            if i < len(candidates):
+                world.assign_worker(candidates[i], v)
+            else:
+                v.job = "Unemployed"
+
     def delete_save(self, world_name):
-        path = self.get_save_path(world_name)
-        if os.path.exists(path):
-            try:
-                os.remove(path)
-                print(f"Deleted save: {world_name}")
-                return True
-            except Exception as e:
-                print(f"Failed to delete save: {e}")
-        return False
+        self.wait_for_save()
+        deleted = False
+        for ext in (SAVE_EXT, ".json", JOURNAL_EXT):
+            path = self.get_save_path(world_name, ext)
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                    deleted = True
+                except Exception as e:
+                    print(f"Failed to delete save: {e}")
+        if deleted:
+            self.update_index(world_name, None)
+            print(f"Deleted save: {world_name}")
+        return deleted
 
     def list_saves(self):
+        # World names, most recently saved first
         saves = []
         for file in os.listdir(self.save_dir):
-            if file.endswith(".json"):
-                saves.append(file.replace(".json", ""))
-        return saves
\ No newline at end of file
+            name, ext = os.path.splitext(file)
+            if ext in (SAVE_EXT, ".json") and file != SAVE_INDEX and name not in saves:
+                saves.append(name)
+        
+        # The directory is the source of truth; bring the index in line with it.
+        # Saves written without going through here (older versions, copied in,
+        # converted) are summarized once, which means reading them this one time.
+        with self.index_lock:
+            index = self.load_index()
+            changed = False
+            for name in list(index):
+                if name not in saves:
+                    del index[name]
+                    changed = True
+            for name in saves:
+                path = self.find_save(name)
+                mtime = os.path.getmtime(path)
+                if index.get(name, {}).get("mtime") == mtime:
+                    continue
+                try:
+                    summary = self.summarize(self.read_world(name, path)[0])
+                except Exception as e:
+                    print(f"Could not read save {name}: {e}")
+                    summary = {}
+                summary["saved_at"] = mtime
+                summary["mtime"] = mtime
+                index[name] = summary
+                changed = True
+            if changed:
+                try:
+                    self.write_save_file(self.get_index_path(), index)
+                except Exception as e:
+                    print(f"Failed to update save index: {e}")
+        
+        saves.sort(key=lambda name: index[name].get("saved_at", 0), reverse=True)
+        return saves
+
+    def get_save_info(self, world_name):
+        # Summary from the index (see list_saves), or {} if unknown
+        return self.load_index().get(world_name, {})
\ No newline at end of file
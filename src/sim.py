@@ -0,0 +1,150 @@
+import argparse
+import math
+import random
+import time
+from .config import *
+from .world import World
+from .resources import ResourceManager
+from .entities import EntityManager
+from .tick_manager import TickManager
+from .save_manager import SaveManager
+from .camera import Camera
+
+# Headless simulation runner for balancing and regression runs.
+# Drives the economy with a virtual clock: no display, no audio, no rendering.
+#
+#   python -m src.sim --world-size Large --days 30 --load mysave
+
+class VirtualClock:
+    # Stands in for pygame.time.get_ticks(); only moves when the sim advances it
+    def __init__(self):
+        self.now = 0.0
+
+    def get_ticks(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms
+
+class NullParticles:
+    # Production still spawns particles, there's just nothing to draw them
+    def spawn_particle(self, x, y, color):
+        pass
+
+    def update(self):
+        pass
+
+class HeadlessGame:
+    # The subset of Game that the simulation managers and SaveManager rely on
+    def __init__(self):
+        self.clock = VirtualClock()
+        self.world_name = None
+        self.is_completed = False
+        self.game_time = 0
+        self.last_minute_tick = 0
+        self.auto_save_timer = 0
+
+        self.save_manager = SaveManager(self)
+        self.particle_manager = NullParticles()
+
+        self.world = None
+        self.camera = None
+        self.resource_manager = None
+        self.hud = None
+        self.ui_manager = None
+        self.input_handler = None
+        self.entity_manager = None
+        self.tick_manager = None
+
+    def init_managers(self):
+        if self.resource_manager is None:
+            self.resource_manager = ResourceManager()
+        if self.entity_manager is None:
+            self.entity_manager = EntityManager(self)
+        if self.tick_manager is None:
+            self.tick_manager = TickManager(self, self.clock.get_ticks)
+
+    def new_world(self, width):
+        self.world = World(width)
+        self.camera = Camera(width * TILE_SIZE, WORLD_HEIGHT * TILE_SIZE) # Only kept so saves have one
+        self.init_managers()
+
+    def step_frame(self, max_ticks=None):
+        # One frame of Game.update(), minus rendering, particles and autosave.
+        # Ticks and entity steps run on fixed clocks, so use the longest frame
+        # TickManager accepts to keep per-frame overhead down, or a shorter one
+        # that runs no more than max_ticks ticks. Frames are whole milliseconds,
+        # as from pygame's clock, rounded up so they don't fall a tick short;
+        # with at most one tick per millisecond the extra never adds up to one.
+        tm = self.tick_manager
+        frame_ms = MAX_FRAME_MS
+        if max_ticks is not None:
+            needed = max_ticks * tm.tick_interval - tm.accumulator
+            frame_ms = min(frame_ms, max(1, math.ceil(needed / tm.time_scale)))
+        self.clock.advance(frame_ms)
+        self.tick_manager.update()
+
+        self.game_time += frame_ms / 1000.0
+        current_minute = int(self.game_time / 60)
+        if current_minute > self.last_minute_tick:
+            self.last_minute_tick = current_minute
+            if current_minute > 3:
+                self.resource_manager.update_food_efficiency()
+
+def elapsed_ticks(tm):
+    # Ticks since the start of day 1
+    return (tm.day_counter - 1) * tm.total_cycle_time + tm.current_time
+
+def run_days(game, days):
+    # Runs up to the start of the day `days` days on; returns the ticks run
+    tm = game.tick_manager
+    start = elapsed_ticks(tm)
+    end = (tm.day_counter - 1 + days) * tm.total_cycle_time
+    while elapsed_ticks(tm) < end:
+        game.step_frame(end - elapsed_ticks(tm))
+    return elapsed_ticks(tm) - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Mineraria economy without a display.")
+    parser.add_argument("--world-size", choices=list(WORLD_SIZES), default="Medium",
+                        help="Size of a freshly generated world (ignored with --load)")
+    parser.add_argument("--load", metavar="NAME", help="Start from the save data/NAME.sav (or .json)")
+    parser.add_argument("--days", type=int, default=1, help="In-game days to simulate")
+    parser.add_argument("--speed", type=int, default=1,
+                        help="Time scale, as set by the in-game speed button (ticks per frame-second, 1-1000)")
+    parser.add_argument("--seed", type=int, help="Seed the RNG for reproducible runs")
+    args = parser.parse_args()
+    if not 1 <= args.speed <= 1000:
+        parser.error("--speed must be between 1 and 1000") # Frames are whole milliseconds, at most one tick each
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    game = HeadlessGame()
+    if args.load:
+        if not game.save_manager.load_game(args.load):
+            print(f"Could not load save: {args.load}")
+            return 1
+    else:
+        game.new_world(WORLD_SIZES[args.world_size])
+
+    tm = game.tick_manager
+    tm.time_scale = args.speed
+    print(f"Simulating {args.days} day(s) on a {game.world.width}-wide world: "
+          f"{len(game.world.buildings)} buildings, {game.entity_manager.get_count()} villagers")
+
+    started = time.perf_counter()
+    ticks = run_days(game, args.days)
+    elapsed = time.perf_counter() - started
+
+    print(f"Ran {ticks} ticks in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/sec)")
+    print(f"Day {tm.day_counter}: {game.entity_manager.get_count()} villagers, "
+          f"happiness {game.resource_manager.happiness:.1f}%, food efficiency {game.resource_manager.food_efficiency:.2f}")
+    print("Final inventory:")
+    for res, amount in game.resource_manager.inventory.items():
+        print(f"  {res}: {amount:.2f}")
+    print(f"  science: {game.resource_manager.science_points:.2f}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+import pygame
+from collections import OrderedDict
+from .config import *
+from .world import Building
+
+class TerrainCache:
+    # Keep roughly 64 MB of chunk surfaces around (4 bytes per pixel)
+    PIXEL_BUDGET = 16 * 1024 * 1024
+
+    def __init__(self, world, assets):
+        self.world = world
+        self.assets = assets
+        self.zoom_level = None
+        self.chunks = OrderedDict() # (chunk_x, chunk_y) -> Surface, least recently drawn first
+        self.cached_pixels = 0
+
+    def flush(self):
+        self.chunks.clear()
+        self.cached_pixels = 0
+
+    def invalidate(self, key):
+        surf = self.chunks.pop(key, None)
+        if surf:
+            self.cached_pixels -= surf.get_width() * surf.get_height()
+
+    def render_chunk(self, cx, cy, size):
+        # Tiles are drawn 1px oversized (like the old per-tile path) to hide seams,
+        # so leave room for the overhang on the last row/column.
+        chunk_px = int(CHUNK_SIZE * size) + 2
+        surf = pygame.Surface((chunk_px, chunk_px), pygame.SRCALPHA)
+        tile_px = int(size) + 1
+
+        sprites = [None if i == TILE_AIR else self.assets.get_scaled(name, tile_px) for i, name in enumerate(TILE_NAMES)]
+        x0, y0 = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+        region = self.world.get_region(x0, y0, x0 + CHUNK_SIZE, y0 + CHUNK_SIZE)
+        # Blits are queued and submitted in one fblits call, in the same order
+        # as before (tiles overlap their neighbours by a pixel, so order matters)
+        batch = []
+        for lx, column in enumerate(region):
+            x = x0 + lx
+            for ly, tile_id in enumerate(bytes(column)):
+                y = y0 + ly
+                pos = (int(lx * size), int(ly * size))
+
+                if tile_id != TILE_AIR:
+                    sprite = sprites[tile_id]
+                    if sprite:
+                        batch.append((sprite, pos))
+
+                building = self.world.get_building_at(x, y)
+                # Rockets animate during launch so they're drawn every frame instead
+                if building and building.type != "Rocket Ship":
+                    sprite = self.assets.get_scaled(building.type, tile_px)
+                    if sprite:
+                        batch.append((sprite, pos))
+                    else:
+                        surf.fblits(batch)
+                        batch = []
+                        pygame.draw.rect(surf, Building.get_color(building.type), (pos[0], pos[1], tile_px, tile_px))
+        surf.fblits(batch)
+        return surf
+
+    def draw(self, screen, camera, start_col, end_col, start_row, end_row):
+        if camera.zoom_level != self.zoom_level:
+            self.zoom_level = camera.zoom_level
+            self.flush()
+
+        # Drop chunks whose tiles or buildings changed since last frame
+        for key in self.world.dirty_chunks:
+            self.invalidate(key)
+        self.world.dirty_chunks.clear()
+
+        size = TILE_SIZE * camera.zoom_level
+        batch = []
+        for cx in range(start_col // CHUNK_SIZE, (end_col - 1) // CHUNK_SIZE + 1):
+            for cy in range(start_row // CHUNK_SIZE, (end_row - 1) // CHUNK_SIZE + 1):
+                key = (cx, cy)
+                surf = self.chunks.get(key)
+                if surf is None:
+                    surf = self.render_chunk(cx, cy, size)
+                    self.chunks[key] = surf
+                    self.cached_pixels += surf.get_width() * surf.get_height()
+                else:
+                    self.chunks.move_to_end(key)
+
+                screen_x, screen_y = camera.world_to_screen(cx * CHUNK_SIZE, cy * CHUNK_SIZE)
+                batch.append((surf, (int(screen_x), int(screen_y))))
+        screen.fblits(batch)
+
+        # LRU eviction, never dropping the chunk we just drew last
+        while self.cached_pixels > self.PIXEL_BUDGET and len(self.chunks) > 1:
+            _, old = self.chunks.popitem(last=False)
+            self.cached_pixels -= old.get_width() * old.get_height()
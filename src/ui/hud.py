@@ -7,6 +7,7 @@ class HUD:
         self.game = game
         self.rm = game.resource_manager
         self.font = pygame.font.SysFont("Arial", 16)
+        self.small_font = pygame.font.SysFont("Arial", 11)
         
         # Icons (Top Left)
         self.build_icon_rect = pygame.Rect(10, 10, 32, 32)
@@ -45,10 +46,9 @@ class HUD:
 
         # Jobs
         draw_icon_bg(screen, self.jobs_icon_rect)
-        v_sprite = assets.get_sprite("villager")
+        v_sprite = assets.get_scaled("villager", 32)
         if v_sprite:
-            scaled = pygame.transform.scale(v_sprite, (32, 32))
-            screen.blit(scaled, self.jobs_icon_rect)
+            screen.blit(v_sprite, self.jobs_icon_rect)
         else:
             j_text = self.font.render("J", True, (60, 40, 30))
             screen.blit(j_text, (self.jobs_icon_rect.centerx - j_text.get_width()//2, self.jobs_icon_rect.centery - j_text.get_height()//2))
@@ -57,7 +57,14 @@ class HUD:
         draw_icon_bg(screen, self.speed_btn_rect)
         speed_val = self.game.tick_manager.time_scale
         s_text = self.font.render(f"{speed_val}x", True, (60, 40, 30))
+        if s_text.get_width() > self.speed_btn_rect.width - 4:
+            s_text = self.small_font.render(f"{speed_val}x", True, (60, 40, 30))
         screen.blit(s_text, (self.speed_btn_rect.centerx - s_text.get_width()//2, self.speed_btn_rect.centery - s_text.get_height()//2))
+        # Can't keep up with the selected speed: show what the game is really running at
+        effective = self.game.tick_manager.effective_scale
+        if effective < speed_val * SPEED_LAG_WARNING:
+            e_text = self.small_font.render(f"~{effective:.0f}x", True, (200, 40, 40))
+            screen.blit(e_text, (self.speed_btn_rect.right + 6, self.speed_btn_rect.centery - e_text.get_height()//2))
 
         # Codex (Items)
         draw_icon_bg(screen, self.codex_icon_rect)
@@ -98,7 +105,7 @@ class HUD:
         content_surf.blit(h_surf, (10, y_off))
         y_off += 18
 
-        has_power_plant = any(b.type == "Power Plant" for b in self.game.world.buildings.values())
+        has_power_plant = self.game.world.count("Power Plant") > 0
 
         for res, amount in self.rm.inventory.items():
             show = amount > 0 or res in ["wood", "stone", "iron", "food"]
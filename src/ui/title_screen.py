@@ -1,5 +1,6 @@
 import pygame
 import sys
+import time
 from ..config import *
 from ..assets import Assets
 
@@ -9,6 +10,7 @@ class TitleScreen:
         self.font_large = pygame.font.SysFont("Arial", 48, bold=True)
         self.font_med = pygame.font.SysFont("Arial", 24)
         self.font_small = pygame.font.SysFont("Arial", 18)
+        self.font_tiny = pygame.font.SysFont("Arial", 13)
         
         self.state = "MAIN" # MAIN, NEW_NAME, NEW_SIZE, LOAD
         self.scroll_y = 0
@@ -26,11 +28,21 @@ class TitleScreen:
 
     def get_size_buttons(self):
         sw, sh = self.game.screen.get_size()
-        return {
-            "Small": pygame.Rect(sw//2 - 150, sh//2 + 20, 90, 40),
-            "Medium": pygame.Rect(sw//2 - 45, sh//2 + 20, 90, 40),
-            "Large": pygame.Rect(sw//2 + 60, sh//2 + 20, 90, 40)
-        }
+        # One 90px button per world size, centered in a row
+        row_width = len(WORLD_SIZES) * 105 - 15
+        left = sw//2 - row_width//2
+        return {size: pygame.Rect(left + i * 105, sh//2 + 20, 90, 40) for i, size in enumerate(WORLD_SIZES)}
+
+    def get_save_details(self, save):
+        info = self.game.save_manager.get_save_info(save)
+        if "day" not in info:
+            return ""
+        parts = [f"Day {info['day']}", f"{info['population']} pop", info["size"]]
+        if info.get("completed"):
+            parts.append("Completed")
+        if info.get("saved_at"):
+            parts.append(time.strftime("%d %b %H:%M", time.localtime(info["saved_at"])))
+        return " | ".join(parts)
 
     def handle_input(self, event):
         sw, sh = self.game.screen.get_size()
@@ -120,9 +132,9 @@ class TitleScreen:
     def draw(self, screen):
         sw, sh = screen.get_size()
         # Draw Background
-        bg = Assets.get().get_sprite("title_bg")
+        bg = Assets.get().get_scaled("title_bg", (sw, sh))
         if bg:
-            screen.blit(pygame.transform.scale(bg, (sw, sh)), (0, 0))
+            screen.blit(bg, (0, 0))
         else:
             screen.fill((50, 50, 100))
 
@@ -184,8 +196,16 @@ class TitleScreen:
                 rect = pygame.Rect(sw//2 - 150, y_pos, 260, 40)
                 pygame.draw.rect(screen, (80, 80, 80), rect)
                 pygame.draw.rect(screen, WHITE, rect, 1)
-                stxt = self.font_med.render(save, True, WHITE)
-                screen.blit(stxt, (rect.x + 10, rect.centery - stxt.get_height()//2))
+                details = self.get_save_details(save)
+                if details:
+                    # Name on top, summary from the save index underneath
+                    stxt = self.font_small.render(save, True, WHITE)
+                    screen.blit(stxt, (rect.x + 10, rect.y + 2))
+                    dtxt = self.font_tiny.render(details, True, (200, 200, 200))
+                    screen.blit(dtxt, (rect.x + 10, rect.bottom - dtxt.get_height() - 3))
+                else:
+                    stxt = self.font_med.render(save, True, WHITE)
+                    screen.blit(stxt, (rect.x + 10, rect.centery - stxt.get_height()//2))
                 
                 # Delete Button
                 del_rect = pygame.Rect(sw//2 + 120, y_pos, 30, 40)
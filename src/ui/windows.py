@@ -221,7 +221,7 @@ class BuildingInspector(Window):
 
             if self.building.type in ["Blast Furnace", "Power Plant", "Advanced Machine Factory"]:
                 if hasattr(self, 'toggle_btn') and self.toggle_btn.collidepoint(event.pos):
-                    self.building.is_on = not self.building.is_on
+                    self.world.toggle_building(self.building)
                     return "HANDLED"
 
             if self.upgrade_btn.collidepoint(event.pos):
@@ -229,7 +229,7 @@ class BuildingInspector(Window):
                     cost = self.building.get_upgrade_cost()
                     if self.rm.has_resources(cost):
                         self.rm.deduct_resources(cost)
-                        self.building.level += 1
+                        self.world.upgrade_building(self.building)
                         self.title = f"{self.building.type} (Lvl {self.building.level})"
                 return "HANDLED"
                 
@@ -237,7 +237,7 @@ class BuildingInspector(Window):
                 cost = Building.get_cost(self.building.type)
                 for res, amount in cost.items():
                     self.rm.add_resource(res, amount)
-                self.world.buildings.pop((self.building.x, self.building.y))
+                self.world.remove_building(self.building.x, self.building.y)
                 return "CLOSE"
         return None
 
@@ -391,10 +391,9 @@ class ItemCodexWindow(Window):
             pygame.draw.rect(screen, (60, 40, 30), pic_rect, 2, border_radius=10)
             
             assets = Assets.get()
-            sprite = assets.get_sprite(f"item_{self.selected_item['name']}")
-            if sprite:
-                # Scaled up for "High Quality" look
-                scaled = pygame.transform.scale(sprite, (128, 128))
+            # Scaled up for "High Quality" look
+            scaled = assets.get_scaled(f"item_{self.selected_item['name']}", 128)
+            if scaled:
                 screen.blit(scaled, (pic_rect.centerx - 64, pic_rect.centery - 64))
             
             # Name
@@ -452,23 +451,22 @@ class WorkerAssignmentWindow(Window):
         y_pos = self.scroll_y
         row_height = 45
         for job in self.jobs:
-            buildings = [b for b in self.world.buildings.values() if b.type == job]
-            count = len(buildings)
+            count = self.world.count(job)
             if count == 0: continue
             
             if job == "House":
-                 total_cap = sum(20 * b.level for b in buildings)
-                 assigned = sum(b.villagers for b in buildings)
+                 total_cap = 20 * self.world.type_levels.get(job, 0)
+                 assigned = sum(b.villagers for b in self.world.get_buildings(job))
                  target = -2
             else:
-                 total_cap = sum(3 * b.level for b in buildings)
-                 assigned = sum(len(b.assigned_workers) for b in buildings)
+                 total_cap = self.world.get_capacity(job)
+                 assigned = self.world.get_worker_count(job)
                  target = self.rm.job_targets.get(job, -1)
             
             assets = Assets.get()
-            sprite = assets.get_sprite(job)
+            sprite = assets.get_scaled(job, 32)
             if sprite:
-                content_surf.blit(pygame.transform.scale(sprite, (32, 32)), (18, y_pos))
+                content_surf.blit(sprite, (18, y_pos))
             
             txt = f"x{count}: {assigned}/{total_cap} v"
             content_surf.blit(self.font.render(txt, True, BLACK), (58, y_pos + 8))
@@ -511,26 +509,26 @@ class WorkerAssignmentWindow(Window):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             for btn, job in self.upgrade_buttons:
                 if btn.collidepoint(event.pos):
-                    buildings = sorted([b for b in self.world.buildings.values() if b.type == job], key=lambda b: b.level)
+                    buildings = sorted(self.world.get_buildings(job), key=lambda b: b.level)
                     for b in buildings:
                         if b.level < 100:
                             cost = b.get_upgrade_cost()
                             if self.rm.has_resources(cost):
                                 self.rm.deduct_resources(cost)
-                                b.level += 1
+                                self.world.upgrade_building(b)
                     return "HANDLED"
             for minus, plus, job in self.controls:
                 curr = self.rm.job_targets.get(job, -1)
-                total_cap = sum(3 * b.level for b in [b for b in self.world.buildings.values() if b.type == job])
+                total_cap = self.world.get_capacity(job)
                 if total_cap == 0: continue
                 if minus.collidepoint(event.pos):
-                    if curr == -1: self.rm.job_targets[job] = total_cap - 1
-                    elif curr > 0: self.rm.job_targets[job] -= 1
+                    if curr == -1: self.rm.set_job_target(job, total_cap - 1)
+                    elif curr > 0: self.rm.set_job_target(job, curr - 1)
                     return "HANDLED"
                 if plus.collidepoint(event.pos):
                     if curr != -1:
-                        if curr + 1 >= total_cap: self.rm.job_targets[job] = -1
-                        else: self.rm.job_targets[job] += 1
+                        if curr + 1 >= total_cap: self.rm.set_job_target(job, -1)
+                        else: self.rm.set_job_target(job, curr + 1)
                     return "HANDLED"
         return None
 
@@ -818,7 +816,7 @@ class BuildingTab(Window):
         if not self.world.has_house(): self.options = ["House"]
         elif not self.world.has_all_workshops(): self.options = ["Logging Workshop", "Stone Refinery", "Mine"]
         else: self.options = ["Logging Workshop", "Stone Refinery", "Mine", "Copper Mine", "Blast Furnace", "Advanced Machine Factory", "Power Plant", "House", "Farm", "Garden", "Oxygenator", "Raw Material Factory", "Rocket Ship", "Warehouse", "Laboratory"]
-        if any(b.type == "Laboratory" for b in self.world.buildings.values()) and "Laboratory" in self.options: self.options.remove("Laboratory")
+        if self.world.count("Laboratory") > 0 and "Laboratory" in self.options: self.options.remove("Laboratory")
         
         self.buttons, self.checkboxes = [], []
         self.content_height = len(self.options) * 50 + 20
@@ -2,6 +2,11 @@ from .config import *
 import random
 import math
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class Building:
     def __init__(self, x, y, b_type):
         self.x = x
@@ -22,6 +27,11 @@ class Building:
         # Specific worker assignments
         self.assigned_workers = [] # List of Villager objects
         
+        # Identity, set by World.add_building. alive is cleared on removal so
+        # holders of a stale reference can tell with a single attribute read.
+        self.id = None
+        self.alive = False
+        
         # Multi-resource support
         self.buffers = {"steel": 0, "copper": 0, "gold": 0, "emerald": 0, "diamond": 0}
         self.histories = {res: [0] for res in self.buffers}
@@ -118,6 +128,9 @@ class Building:
         return (255, 0, 255)
 
 class Tile:
+    # Lightweight view of one cell, built on demand by World.get_tile
+    __slots__ = ("x", "y", "tile_type")
+
     def __init__(self, x, y, tile_type):
         self.x = x
         self.y = y
@@ -127,8 +140,34 @@ class World:
     def __init__(self, width=150):
         self.width = width
         self.height = WORLD_HEIGHT
-        self.grid = [[None for _ in range(self.height)] for _ in range(self.width)]
+        # Tile ids (TILE_AIR, TILE_GRASS, ...), one byte per tile, indexed x * height + y
+        self.tiles = bytearray(self.width * self.height)
+        self.surface = [self.height] * self.width # First solid y per column (height if none)
         self.buildings = {} # Key: (x,y) tuple, Value: Building object
+        self.dirty_chunks = set() # (chunk_x, chunk_y) keys that need re-rendering
+        
+        # Per-type index and aggregates, kept in sync by add/remove/upgrade/assign
+        self.by_type = {} # type -> list of Building
+        self.type_levels = {} # type -> sum of building levels (capacity is 3 per level)
+        self.type_workers = {} # type -> total assigned workers
+        self.type_staffed = {} # type -> buildings with at least 3 workers
+        self.open_slots = {} # type -> buildings with fewer workers than 3 per level (dict used as an ordered set)
+        self.layout_version = 0 # Bumped on add/remove/upgrade/toggle
+        self.capacity_version = 0 # Bumped on add/remove/upgrade, which change job slots
+        self.next_building_id = 1
+        self.staffing_version = 0 # Bumped when workers are (un)assigned
+        
+        # Night light sources, and the light map chunks they reach that need redrawing
+        self.light_sources = {} # (x, y) -> Building of a LIGHT_SOURCE_TYPES type
+        self.dirty_light_chunks = set()
+        
+        # Spatial hash for radius queries
+        self.spatial = {} # (cell_x, cell_y) -> list of Building
+        
+        # Cached proximity effects, rebuilt lazily when their sources change
+        self.warehouse_bonus = {} # (x, y) -> production multiplier from staffed warehouses
+        self.bonus_dirty = True
+        self.refinery_coverage = None # bytearray indexed x * height + y, 1 = near a refinery
         self.generate()
 
     def generate(self):
@@ -146,38 +185,97 @@ class World:
         # Smooth bottom variations using a long sine wave instead of random noise
         bottom_variations = [1.0 + math.sin(x * 0.03) * 0.15 for x in range(self.width)]
 
+        # Smoothly narrow the width as we go deeper
+        width_variances = [math.sin(y * 0.1) * 1.5 for y in range(self.height)]
+
+        # Base shape logic
+        base_max_dist = (self.width // 2) * 0.85
+
+        if np is not None:
+            self.generate_vectorized(SURFACE_LEVEL, CENTER_X, base_max_dist, surface_offsets, bottom_variations, width_variances)
+            return
+
         for x in range(self.width):
             dist_from_center = abs(x - CENTER_X)
             local_surface = SURFACE_LEVEL + surface_offsets[x]
+            column = x * self.height
             
             for y in range(self.height):
-                tile_type = "air"
-                
-                # Base shape logic
-                base_max_dist = (self.width // 2) * 0.85
+                tile_type = TILE_AIR
                 
                 if y >= local_surface:
                     depth = y - local_surface
                     
-                    # Smoothly narrow the width as we go deeper
-                    width_variance = math.sin(y * 0.1) * 1.5
-                    max_dist = (base_max_dist - (depth * 2.0)) * bottom_variations[x] + width_variance
+                    max_dist = (base_max_dist - (depth * 2.0)) * bottom_variations[x] + width_variances[y]
                     
                     if dist_from_center <= max_dist:
                         if y == local_surface:
-                            tile_type = "grass"
+                            tile_type = TILE_GRASS
                         elif depth < 5:
-                            tile_type = "dirt"
+                            tile_type = TILE_DIRT
                         else:
-                            tile_type = "stone"
+                            tile_type = TILE_STONE
                 
-                self.grid[x][y] = Tile(x, y, tile_type)
+                self.tiles[column + y] = tile_type
+        self.rebuild_surface()
+
+    def generate_vectorized(self, surface_level, center_x, base_max_dist, surface_offsets, bottom_variations, width_variances):
+        # Same shape as the loop in generate(), evaluated over the whole grid at once.
+        # The sine tables come from math.sin and the float ops run in the same order,
+        # so the result is bit-identical to the per-tile loop.
+        dist_from_center = np.abs(np.arange(self.width) - center_x)[:, None]
+        local_surface = (surface_level + np.array(surface_offsets))[:, None]
+        depth = np.arange(self.height)[None, :] - local_surface
+        max_dist = (base_max_dist - (depth * 2.0)) * np.array(bottom_variations)[:, None] + np.array(width_variances)[None, :]
+
+        grid = np.where(depth < 5, TILE_DIRT, TILE_STONE).astype(np.uint8)
+        grid[depth == 0] = TILE_GRASS
+        grid[(depth < 0) | (dist_from_center > max_dist)] = TILE_AIR
+        self.tiles[:] = grid.tobytes()
+        self.rebuild_surface()
+
+    def rebuild_surface(self):
+        h = self.height
+        for x in range(self.width):
+            column = self.tiles[x * h:(x + 1) * h]
+            self.surface[x] = h - len(column.lstrip(bytes([TILE_AIR])))
 
     def get_tile(self, x, y):
+        # Compatibility shim for code that still wants a Tile object
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[x][y]
+            return Tile(x, y, TILE_NAMES[self.tiles[x * self.height + y]])
         return None
 
+    def get_tile_id(self, x, y):
+        # Out of bounds reads as air
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tiles[x * self.height + y]
+        return TILE_AIR
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_solid(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self.tiles[x * self.height + y] != TILE_AIR
+
+    def surface_height(self, x):
+        # y of the topmost solid tile in column x (height if the column is empty)
+        if 0 <= x < self.width:
+            return self.surface[x]
+        return self.height
+
+    def get_region(self, x0, y0, x1, y1):
+        # Tile ids for columns x0..x1-1 and rows y0..y1-1 (clamped to the world),
+        # indexable as region[x - x0][y - y0]. A 2D uint8 array when NumPy is
+        # available, otherwise a list of per-column bytearrays.
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if np is not None:
+            grid = np.frombuffer(self.tiles, dtype=np.uint8).reshape(self.width, self.height)
+            return grid[x0:x1, y0:y1]
+        h = self.height
+        return [self.tiles[x * h + y0:x * h + y1] for x in range(x0, x1)]
+
     def place_building(self, x, y, b_type):
         # Check bounds
         if not (0 <= x < self.width and 0 <= y < self.height):
@@ -195,20 +293,231 @@ class World:
             # This implies if I click a building, I might place one above it.
             return False 
 
-        self.buildings[(x, y)] = Building(x, y, b_type)
+        self.add_building(Building(x, y, b_type))
         return True
 
+    def add_building(self, building):
+        if building.id is None:
+            building.id = self.next_building_id
+        self.next_building_id = max(self.next_building_id, building.id + 1)
+        building.alive = True
+        self.buildings[(building.x, building.y)] = building
+        t = building.type
+        self.by_type.setdefault(t, []).append(building)
+        self.type_levels[t] = self.type_levels.get(t, 0) + building.level
+        workers = len(building.assigned_workers)
+        self.type_workers[t] = self.type_workers.get(t, 0) + workers
+        self.type_staffed[t] = self.type_staffed.get(t, 0) + (1 if workers >= 3 else 0)
+        self.update_open_slots(building)
+        self.spatial.setdefault(self.spatial_key(building.x, building.y), []).append(building)
+        self.on_proximity_source_added(building)
+        if t in LIGHT_SOURCE_TYPES:
+            self.light_sources[(building.x, building.y)] = building
+            self.mark_light_dirty(building.x, building.y)
+        self.layout_version += 1
+        self.capacity_version += 1
+        self.mark_dirty(building.x, building.y)
+
+    def remove_building(self, x, y):
+        building = self.buildings.pop((x, y), None)
+        if building:
+            t = building.type
+            self.by_type[t].remove(building)
+            self.type_levels[t] -= building.level
+            workers = len(building.assigned_workers)
+            self.type_workers[t] -= workers
+            if workers >= 3:
+                self.type_staffed[t] -= 1
+            self.open_slots[t].pop(building, None)
+            self.spatial[self.spatial_key(x, y)].remove(building)
+            self.on_proximity_source_removed(building)
+            if self.light_sources.pop((x, y), None):
+                self.mark_light_dirty(x, y)
+            self.layout_version += 1
+            self.capacity_version += 1
+            self.mark_dirty(x, y)
+            building.alive = False
+            
+            # Send the workers off; their counts already left with the building.
+            # Anyone inside gets ejected on their next update.
+            for villager in list(building.assigned_workers):
+                self.unassign_worker(villager)
+                villager.job = "Unemployed"
+        return building
+
+    def upgrade_building(self, building):
+        building.level += 1
+        if self.is_live(building):
+            self.type_levels[building.type] += 1
+            self.update_open_slots(building)
+            self.layout_version += 1
+            self.capacity_version += 1
+        self.mark_dirty(building.x, building.y)
+
+    def toggle_building(self, building):
+        building.is_on = not building.is_on
+        self.layout_version += 1
+
+    def is_live(self, building):
+        return building.alive
+
+    def assign_worker(self, building, villager):
+        building.assigned_workers.append(villager)
+        villager.assigned_building = building
+        if self.is_live(building):
+            t = building.type
+            self.type_workers[t] += 1
+            self.staffing_version += 1
+            self.update_open_slots(building)
+            if len(building.assigned_workers) == 3:
+                self.type_staffed[t] += 1
+                if t == "Warehouse":
+                    self.bonus_dirty = True
+
+    def unassign_worker(self, villager):
+        building = villager.assigned_building
+        villager.assigned_building = None
+        if building is None or villager not in building.assigned_workers:
+            return
+        building.assigned_workers.remove(villager)
+        if self.is_live(building):
+            t = building.type
+            self.type_workers[t] -= 1
+            self.staffing_version += 1
+            self.update_open_slots(building)
+            if len(building.assigned_workers) == 2:
+                self.type_staffed[t] -= 1
+                if t == "Warehouse":
+                    self.bonus_dirty = True
+
+    def update_open_slots(self, building):
+        slots = self.open_slots.setdefault(building.type, {})
+        if len(building.assigned_workers) < 3 * building.level:
+            slots.setdefault(building, None) # Joins at the back if it wasn't open
+        else:
+            slots.pop(building, None)
+
+    def get_open_slots(self, b_type):
+        # Buildings of a type with room for another worker, longest open first.
+        # Shared dict, don't mutate.
+        return self.open_slots.get(b_type, {})
+
+    def get_buildings(self, b_type):
+        # Shared list, don't mutate
+        return self.by_type.get(b_type, [])
+
+    def count(self, b_type):
+        return len(self.by_type.get(b_type, []))
+
+    def get_capacity(self, b_type):
+        return 3 * self.type_levels.get(b_type, 0)
+
+    def get_worker_count(self, b_type):
+        return self.type_workers.get(b_type, 0)
+
+    def get_staffed_count(self, b_type):
+        return self.type_staffed.get(b_type, 0)
+
+    def mark_dirty(self, x, y):
+        self.dirty_chunks.add((x // CHUNK_SIZE, y // CHUNK_SIZE))
+
+    def mark_light_dirty(self, x, y):
+        # Every light map chunk within LIGHT_RADIUS of the light
+        for cx in range((x - LIGHT_RADIUS) // CHUNK_SIZE, (x + LIGHT_RADIUS) // CHUNK_SIZE + 1):
+            for cy in range((y - LIGHT_RADIUS) // CHUNK_SIZE, (y + LIGHT_RADIUS) // CHUNK_SIZE + 1):
+                self.dirty_light_chunks.add((cx, cy))
+
     def get_building_at(self, x, y):
         return self.buildings.get((x, y))
 
+    def spatial_key(self, x, y):
+        return (x // SPATIAL_CELL_SIZE, y // SPATIAL_CELL_SIZE)
+
+    def lights_in(self, x0, y0, x1, y1):
+        # Light sources with x0 <= x < x1 and y0 <= y < y1
+        found = []
+        min_cx, min_cy = self.spatial_key(x0, y0)
+        max_cx, max_cy = self.spatial_key(x1 - 1, y1 - 1)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for b in self.spatial.get((cx, cy), ()):
+                    if x0 <= b.x < x1 and y0 <= b.y < y1 and (b.x, b.y) in self.light_sources:
+                        found.append(b)
+        return found
+
+    def query_radius(self, x, y, radius, b_type=None):
+        # Buildings within Euclidean distance `radius` of (x, y)
+        found = []
+        r2 = radius * radius
+        min_cx, min_cy = self.spatial_key(int(x - radius), int(y - radius))
+        max_cx, max_cy = self.spatial_key(int(x + radius), int(y + radius))
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for b in self.spatial.get((cx, cy), ()):
+                    if b_type and b.type != b_type:
+                        continue
+                    if (b.x - x)**2 + (b.y - y)**2 <= r2:
+                        found.append(b)
+        return found
+
+    def on_proximity_source_added(self, building):
+        if building.type == "Warehouse" and len(building.assigned_workers) >= 3:
+            self.bonus_dirty = True
+        elif not self.bonus_dirty:
+            # Only the new building's own bonus is missing
+            bonus = 1.0
+            for w in self.query_radius(building.x, building.y, WAREHOUSE_RADIUS, "Warehouse"):
+                if len(w.assigned_workers) >= 3:
+                    bonus += 0.1
+            if bonus != 1.0:
+                self.warehouse_bonus[(building.x, building.y)] = bonus
+        if building.type == "Stone Refinery":
+            self.refinery_coverage = None
+
+    def on_proximity_source_removed(self, building):
+        if building.type == "Warehouse" and len(building.assigned_workers) >= 3:
+            self.bonus_dirty = True
+        else:
+            self.warehouse_bonus.pop((building.x, building.y), None)
+        if building.type == "Stone Refinery":
+            self.refinery_coverage = None
+
+    def rebuild_warehouse_bonus(self):
+        self.warehouse_bonus = {}
+        for w in self.get_buildings("Warehouse"):
+            if len(w.assigned_workers) >= 3:
+                for b in self.query_radius(w.x, w.y, WAREHOUSE_RADIUS):
+                    key = (b.x, b.y)
+                    self.warehouse_bonus[key] = self.warehouse_bonus.get(key, 1.0) + 0.1
+        self.bonus_dirty = False
+
+    def get_warehouse_bonus(self, building):
+        if self.bonus_dirty:
+            self.rebuild_warehouse_bonus()
+        return self.warehouse_bonus.get((building.x, building.y), 1.0)
+
+    def rebuild_refinery_coverage(self):
+        coverage = bytearray(self.width * self.height)
+        r = REFINERY_RADIUS
+        for b in self.get_buildings("Stone Refinery"):
+            for x in range(max(0, b.x - r), min(self.width, b.x + r + 1)):
+                dx2 = (x - b.x)**2
+                for y in range(max(0, b.y - r), min(self.height, b.y + r + 1)):
+                    if dx2 + (y - b.y)**2 <= r * r:
+                        coverage[x * self.height + y] = 1
+        self.refinery_coverage = coverage
+
+    def is_near_refinery(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        if self.refinery_coverage is None:
+            self.rebuild_refinery_coverage()
+        return self.refinery_coverage[x * self.height + y] == 1
+
     def has_house(self):
-        for b in self.buildings.values():
-            if b.type == "House":
-                return True
-        return False
+        return self.count("House") > 0
 
     def has_all_workshops(self):
-        types = [b.type for b in self.buildings.values()]
-        return "Logging Workshop" in types and "Stone Refinery" in types and "Mine" in types
+        return self.count("Logging Workshop") > 0 and self.count("Stone Refinery") > 0 and self.count("Mine") > 0
 
     
\ No newline at end of file
@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+import time
+
+# Rendering benchmark: frame time at each zoom level on a 300-wide world with
+# 500 villagers on the surface, drawn headless. Also times the villager pass
+# as one blit call per sprite against a single fblits call on the same
+# sequence, and re-rendering the visible terrain chunks from scratch.
+#
+#   python tools/bench_render.py
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT) # Assets load from relative paths
+
+import contextlib
+import io
+import pygame
+from src.config import *
+from src.game import Game
+
+ZOOM_LEVELS = [0.5, 1.0, 1.5, 2.0, 3.0]
+JOBS = ["Unemployed"] + list(JOB_COLORS)
+
+def build_game(width=300, villagers=500):
+    random.seed(width)
+    with contextlib.redirect_stdout(io.StringIO()): # Music/asset messages
+        game = Game()
+        game.start_new_game("bench", width)
+    game.ui_manager.windows = []
+    game.ui_manager.active_window = None
+    world = game.world
+    types = ["House", "Mine", "Farm", "Laboratory", "Stone Refinery", "Logging Workshop"]
+    for x in range(0, world.width, 3):
+        world.place_building(x, world.surface_height(x) - 1, random.choice(types))
+    for _ in range(villagers):
+        x = random.uniform(0, world.width)
+        game.entity_manager.spawn_villager(x, world.surface_height(int(x)) - 1, random.choice(JOBS))
+    game.tick_manager.current_time = 100 # Daytime
+    return game
+
+def best_of(fn, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def villager_batch(game):
+    # The same (sprite, pos) sequence draw_game builds
+    camera = game.camera
+    size = TILE_SIZE * camera.zoom_level
+    v_size = size * 0.8
+    batch = []
+    for villager, vx, vy in game.entity_manager.visible_villagers(0.0):
+        sx, sy = camera.world_to_screen(vx, vy)
+        sprite = game.assets.get_tinted("villager", int(v_size), JOB_COLORS.get(villager.job, WHITE))
+        if sprite:
+            batch.append((sprite, (int(sx + (size - v_size) / 2), int(sy + size - v_size))))
+    return batch
+
+def blit_each(screen, batch):
+    for sprite, pos in batch:
+        screen.blit(sprite, pos)
+
+if __name__ == "__main__":
+    game = build_game()
+    screen = game.screen
+    world = game.world
+
+    print(f"{'zoom':>5}{'frame (ms)':>12}{'chunks (ms)':>13}{'villagers':>11}"
+          f"{'blit (ms)':>11}{'fblits (ms)':>13}")
+    for zoom in ZOOM_LEVELS:
+        camera = game.camera
+        camera.zoom_level = zoom
+        game.assets.flush_scaled()
+        # Centre on the middle of the world, on the surface
+        mid = world.width // 2
+        camera.offset_x = mid * TILE_SIZE - SCREEN_WIDTH / zoom / 2
+        camera.offset_y = world.surface_height(mid) * TILE_SIZE - SCREEN_HEIGHT / zoom / 2
+        game.draw_game() # Warm the chunk and sprite caches
+
+        frame = best_of(game.draw_game, 20)
+        cold = best_of(lambda: (game.terrain_cache.flush(), game.draw_game()), 5) - frame
+        batch = villager_batch(game)
+        each = best_of(lambda: blit_each(screen, batch), 20)
+        batched = best_of(lambda: screen.fblits(batch), 20)
+        print(f"{zoom:>5.1f}{frame:>12.2f}{cold:>13.2f}{len(batch):>11}{each:>11.3f}{batched:>13.3f}")
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Save/load benchmark: JSON vs the compressed binary format on generated
+# colonies of increasing size (time to save, time to load, file size).
+#
+#   python tools/bench_saves.py
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sim import HeadlessGame
+from src.recipes import RECIPES
+
+BUILDING_TYPES = list(RECIPES) + ["House", "Warehouse"]
+
+def build_colony(width, buildings, villagers):
+    random.seed(buildings)
+    game = HeadlessGame()
+    game.new_world(width)
+    game.world_name = "bench"
+    world = game.world
+    placed = []
+    while len(placed) < buildings:
+        x, y = random.randrange(world.width), random.randrange(world.height)
+        if world.place_building(x, y, random.choice(BUILDING_TYPES)):
+            b = world.get_building_at(x, y)
+            b.production_history = [random.random() * 50 for _ in range(7)]
+            for h in b.histories.values():
+                h.extend(random.random() for _ in range(6))
+            placed.append(b)
+    for _ in range(villagers):
+        v = game.entity_manager.spawn_villager(random.uniform(0, world.width), random.uniform(0, world.height))
+        b = random.choice(placed)
+        if len(b.assigned_workers) < 3 * b.level:
+            world.assign_worker(b, v)
+            v.job = b.type
+    return game
+
+def bench(game, fmt, repeats):
+    manager = game.save_manager
+    manager.save_format = fmt
+    save_time = load_time = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        manager.save_game()
+        elapsed = time.perf_counter() - start
+        save_time = elapsed if save_time is None else min(save_time, elapsed)
+    size = os.path.getsize(manager.get_save_path(game.world_name))
+
+    loader = HeadlessGame()
+    loader.save_manager.save_dir = manager.save_dir
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader.save_manager.load_game(game.world_name)
+        elapsed = time.perf_counter() - start
+        load_time = elapsed if load_time is None else min(load_time, elapsed)
+    manager.delete_save(game.world_name)
+    return save_time, load_time, size
+
+if __name__ == "__main__":
+    colonies = [(150, 200, 500), (300, 2000, 5000), (2000, 10000, 20000)]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, buildings, villagers in colonies:
+            game = build_colony(width, buildings, villagers)
+            game.save_manager.save_dir = tmp
+            repeats = 3 if buildings <= 2000 else 1
+            with contextlib.redirect_stdout(io.StringIO()): # Silence "Game Saved/Loaded"
+                results = {fmt: bench(game, fmt, repeats) for fmt in ("json", "binary")}
+            rows.append((buildings, villagers, results))
+
+    print(f"{'buildings':>10}{'villagers':>10}  {'format':<7}{'save (ms)':>10}{'load (ms)':>10}{'size (KB)':>11}")
+    for buildings, villagers, results in rows:
+        for fmt, (save_time, load_time, size) in results.items():
+            print(f"{buildings:>10}{villagers:>10}  {fmt:<7}{save_time * 1000:>10.1f}{load_time * 1000:>10.1f}{size / 1024:>11.1f}")
+        j, b = results["json"], results["binary"]
+        print(f"{'':>20}  binary is {j[2] / b[2]:.1f}x smaller, saves {j[0] / b[0]:.1f}x and loads {j[1] / b[1]:.1f}x as fast")
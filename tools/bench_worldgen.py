@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+# World generation benchmark: time per world size for the NumPy path and the
+# per-tile loop, and check both produce the same tiles.
+#
+#   python tools/bench_worldgen.py
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.world as world_module
+from src.world import World
+from src.config import WORLD_SIZES
+
+def time_generate(width, use_numpy, repeats):
+    saved_np = world_module.np
+    if not use_numpy:
+        world_module.np = None
+    try:
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            world = World(width)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        world_module.np = saved_np
+    return best, world
+
+if __name__ == "__main__":
+    if world_module.np is None:
+        print("NumPy is not installed; only the per-tile loop will be timed.")
+
+    print(f"{'size':<10}{'width':>7}{'numpy (ms)':>13}{'loop (ms)':>12}{'speedup':>10}  identical")
+    mismatch = False
+    for name, width in WORLD_SIZES.items():
+        repeats = 5 if width <= 300 else 1
+        vec_time, vec_world = time_generate(width, True, repeats) if world_module.np is not None else (None, None)
+        loop_time, loop_world = time_generate(width, False, repeats)
+
+        identical = "-"
+        if vec_world and loop_world:
+            same = vec_world.tiles == loop_world.tiles and vec_world.surface == loop_world.surface
+            identical = "yes" if same else "NO"
+            mismatch = mismatch or not same
+
+        vec_txt = f"{vec_time * 1000:.1f}" if vec_time is not None else "-"
+        loop_txt = f"{loop_time * 1000:.1f}" if loop_time is not None else "-"
+        speedup = f"{loop_time / vec_time:.1f}x" if vec_time and loop_time else "-"
+        print(f"{name:<10}{width:>7}{vec_txt:>13}{loop_txt:>12}{speedup:>10}  {identical}")
+
+    sys.exit(1 if mismatch else 0)
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import sys
+
+# Converts saves between the JSON format and the compressed binary format.
+# Autosaves recorded in the save's journal (data/<name>.journal) are replayed
+# into the converted copy, which is a full save with no journal of its own.
+#
+# Converting to binary upgrades a save in place: the copy goes next to the
+# source and, being newer, is the one the game loads. JSON copies are for
+# reading and go to an exports/ folder beside the source, where the game
+# doesn't see them (as SaveManager.export_json does).
+#
+#   python tools/convert_save.py data/myworld.json            # -> data/myworld.sav
+#   python tools/convert_save.py data/myworld.sav --to json   # -> data/exports/myworld.json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import save_format, save_journal
+from src.config import SAVE_EXT, JOURNAL_EXT
+
+def convert(src, to, dest=None, keep=True):
+    with open(src, "rb") as f:
+        blob = f.read()
+    data = save_format.decode(blob) if save_format.is_binary(blob) else json.loads(blob)
+    journal = os.path.splitext(src)[0] + JOURNAL_EXT
+    replayed = save_journal.replay(data, journal)
+    data.pop("journal_id", None) # The journal belongs to the source file
+
+    if dest is None:
+        folder, name = os.path.split(os.path.splitext(src)[0])
+        if to == "json":
+            dest = os.path.join(folder, "exports", name + ".json")
+        else:
+            dest = os.path.join(folder, name + SAVE_EXT)
+    if os.path.dirname(dest):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if os.path.abspath(dest) == os.path.abspath(src):
+        print(f"{src} is already in {to} format")
+        return dest
+
+    if to == "json":
+        with open(dest, "w") as f:
+            json.dump(data, f, indent=1)
+    else:
+        with open(dest, "wb") as f:
+            f.write(save_format.encode(data))
+    note = f" + {journal} ({replayed} bytes)" if replayed else ""
+    print(f"{src} ({os.path.getsize(src)} bytes){note} -> {dest} ({os.path.getsize(dest)} bytes)")
+
+    if not keep:
+        os.remove(src)
+        if os.path.exists(journal):
+            os.remove(journal)
+    return dest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Mineraria saves between JSON and binary.")
+    parser.add_argument("saves", nargs="+", help="Save files to convert")
+    parser.add_argument("--to", choices=["binary", "json"], default="binary")
+    parser.add_argument("--out", help="Output path (only with a single input)")
+    parser.add_argument("--delete", action="store_true", help="Remove the source file (and its journal) after converting")
+    args = parser.parse_args()
+
+    if args.out and len(args.saves) > 1:
+        parser.error("--out needs a single input file")
+    failed = False
+    for path in args.saves:
+        try:
+            convert(path, args.to, args.out, keep=not args.delete)
+        except Exception as e:
+            print(f"Failed to convert {path}: {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,81 @@
+import random
+import sys
+
+from src import entities
+from src.sim import HeadlessGame
+from src.entities import np
+
+# Checks that villagers dropped from high up land on the ground instead of
+# falling through it, on both the NumPy (batched) and the per-villager path,
+# and that a reference to a removed villager can't touch a live one.
+
+MIN_DROP = 20 # Tiles
+
+def drop(batched, x):
+    random.seed(x)
+    game = HeadlessGame()
+    game.new_world(150)
+    world = game.world
+    ground = world.surface_height(x)
+    v = game.entity_manager.spawn_villager(x + 0.5, 0.0)
+    for _ in range(400):
+        if batched:
+            game.entity_manager.update()
+        else:
+            v.update()
+        if v.index < 0 or v.vy == 0: # Gone, or landed
+            break
+    errors = []
+    if v.index < 0:
+        errors.append(f"fell through the ground at x={x} (surface at y={ground})")
+    elif int(v.y) != ground - 1 or v.vy != 0:
+        errors.append(f"at y={v.y:.2f} (vy {v.vy:.2f}), expected to stand at y={ground - 1}")
+    return ground, errors
+
+def stale_reference():
+    game = HeadlessGame()
+    game.new_world(150)
+    manager = game.entity_manager
+    gone, a, b = (manager.spawn_villager(10.0 + i, 5.0, "Mine") for i in range(3))
+    manager.remove_villager(gone) # b moves into gone's row
+    manager.remove_villager(gone) # Already removed: nothing happens
+    before = [(v.x, v.y, v.state, v.job, v.assigned_building) for v in (a, b)]
+
+    errors = []
+    for name, value in (("x", 99.0), ("vy", 1.0), ("state", "WALK"), ("job", "Unemployed"), ("assigned_building", None)):
+        try:
+            getattr(gone, name)
+            errors.append(f"reading {name} of a removed villager didn't raise")
+        except ReferenceError:
+            pass
+        try:
+            setattr(gone, name, value)
+            errors.append(f"writing {name} of a removed villager didn't raise")
+        except ReferenceError:
+            pass
+    if [(v.x, v.y, v.state, v.job, v.assigned_building) for v in (a, b)] != before:
+        errors.append("a removed villager's reference changed a live villager")
+    if manager.get_count() != 2 or gone in manager.unemployed:
+        errors.append("removed villager is still counted")
+    return errors
+
+if __name__ == "__main__":
+    entities.WANDER_CHANCE = 0 # Landed villagers stay put
+    paths = [("per-villager", False)] + ([("batched", True)] if np is not None else [])
+    failed = False
+    for label, batched in paths:
+        for x in range(10, 140, 13):
+            ground, errors = drop(batched, x)
+            if ground < MIN_DROP:
+                continue
+            print(f"{label}, drop of {ground} tiles at x={x}: {'OK' if not errors else 'FAIL'}")
+            for e in errors:
+                print("   ", e)
+            failed = failed or bool(errors)
+
+    errors = stale_reference()
+    print(f"removed villager reference: {'OK' if not errors else 'FAIL'}")
+    for e in errors:
+        print("   ", e)
+    failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
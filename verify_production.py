@@ -0,0 +1,105 @@
+import copy
+import random
+import sys
+from types import SimpleNamespace
+
+from src.world import World
+from src.resources import ResourceManager
+from src.recipes import RECIPES
+from src.production import ProductionEngine, VectorProductionEngine, np
+
+# Checks that the NumPy production path gives the same results as the
+# scalar one for every building type, with plenty, scarce and starved stock.
+
+class Worker:
+    def __init__(self):
+        self.assigned_building = None
+
+class Particles:
+    def __init__(self):
+        self.spawned = []
+
+    def spawn_particle(self, x, y, color):
+        self.spawned.append((x, y, color))
+
+def build_colony(seed, stock, types):
+    rng = random.Random(seed)
+    world = World(150)
+    rm = ResourceManager()
+    if seed % 2 == 0:
+        rm.unlocked_techs.append("Electronics")
+    rm.happiness = rng.uniform(0, 30)
+    rm.food_efficiency = rng.uniform(0.5, 1.0)
+    for res in rm.inventory:
+        rm.inventory[res] = stock * rng.uniform(0.5, 1.5)
+
+    for i in range(400):
+        x, y = rng.randrange(world.width), rng.randrange(world.height)
+        if not world.place_building(x, y, rng.choice(types)):
+            continue
+        b = world.get_building_at(x, y)
+        for _ in range(rng.randint(0, 4)):
+            world.upgrade_building(b)
+        for _ in range(rng.randint(0, 3 * b.level)):
+            world.assign_worker(b, Worker())
+        if rng.random() < 0.2:
+            world.toggle_building(b)
+    return SimpleNamespace(world=world, resource_manager=rm, particle_manager=Particles())
+
+def run(game, engine, ticks):
+    random.seed(1234)
+    for tick in range(ticks):
+        engine.run(1 + tick // 5) # Cross a few day boundaries
+    return game
+
+def close(a, b):
+    return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+
+def compare(scalar, vector):
+    errors = []
+    for res, amount in scalar.resource_manager.inventory.items():
+        if not close(amount, vector.resource_manager.inventory[res]):
+            errors.append(f"inventory[{res}]: {amount} != {vector.resource_manager.inventory[res]}")
+    if not close(scalar.resource_manager.science_points, vector.resource_manager.science_points):
+        errors.append("science_points differ")
+    for pos, b in scalar.world.buildings.items():
+        v = vector.world.buildings[pos]
+        if not close(b.production_buffer, v.production_buffer):
+            errors.append(f"{b.type} at {pos}: buffer {b.production_buffer} != {v.production_buffer}")
+        if len(b.production_history) != len(v.production_history) or not all(
+                close(p, q) for p, q in zip(b.production_history, v.production_history)):
+            errors.append(f"{b.type} at {pos}: history {b.production_history} != {v.production_history}")
+    if scalar.particle_manager.spawned != vector.particle_manager.spawned:
+        errors.append("particle spawns differ")
+    return errors
+
+if __name__ == "__main__":
+    if np is None:
+        print("NumPy is not installed; nothing to compare.")
+        sys.exit(0)
+
+    every_type = list(RECIPES) + ["Warehouse", "House", "Rocket Ship"]
+    converters = [t for t, r in RECIPES.items() if any(line["inputs"] for line in r["lines"])] + ["Warehouse"]
+    scenarios = (("plenty", 1e6, every_type), ("scarce", 5.0, every_type), ("starved", 5.0, converters))
+
+    failed = False
+    covered = set()
+    for seed in range(6):
+        for label, stock, types in scenarios:
+            base = build_colony(seed, stock, types)
+            scalar = copy.deepcopy(base)
+            vector = copy.deepcopy(base)
+            run(scalar, ProductionEngine(scalar), 25)
+            run(vector, VectorProductionEngine(vector, threshold=0), 25)
+            errors = compare(scalar, vector)
+            covered.update(t for t in RECIPES if base.world.count(t))
+            status = "OK" if not errors else "MISMATCH"
+            print(f"seed {seed} ({label}): {status} - {len(base.world.buildings)} buildings")
+            for e in errors[:10]:
+                print("   ", e)
+            failed = failed or bool(errors)
+
+    missing = set(RECIPES) - covered
+    if missing:
+        print(f"Recipe types never exercised: {sorted(missing)}")
+    sys.exit(1 if failed or missing else 0)
@@ -0,0 +1,207 @@
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.sim import HeadlessGame
+from src.recipes import RECIPES
+from tools.convert_save import convert
+
+# Save/load checks: workplaces survive a save and load, and older saves (JSON
+# without building ids or workplaces) come back the same whether they're
+# loaded directly or converted to the binary format first, with no worker
+# left holding a job but no building. Converting a save keeps the autosaves
+# in its journal, and readable JSON copies stay out of the way of later
+# saves. Also checks that an autosave snapshot
+# doesn't change as the game moves on, and reports what it costs the main
+# thread at 2000 buildings / 5000 villagers (for information only: wall-clock
+# times depend on the machine and its load, so they don't fail the run).
+
+SNAPSHOT_BUDGET_MS = 8.0 # Half a frame at 60 FPS
+
+BUILDING_TYPES = list(RECIPES) + ["House", "Warehouse"]
+
+def build_colony(seed, buildings=300, villagers=1500):
+    random.seed(seed)
+    game = HeadlessGame()
+    game.new_world(300)
+    game.world_name = f"colony{seed}"
+    world = game.world
+    placed = []
+    while len(placed) < buildings:
+        x, y = random.randrange(world.width), random.randrange(world.height)
+        if world.place_building(x, y, random.choice(BUILDING_TYPES)):
+            b = world.get_building_at(x, y)
+            for _ in range(random.randint(0, 2)):
+                world.upgrade_building(b)
+            placed.append(b)
+    for _ in range(villagers):
+        v = game.entity_manager.spawn_villager(random.uniform(0, world.width), random.uniform(0, world.height))
+        b = random.choice(placed)
+        if b.type == "House":
+            continue
+        if len(b.assigned_workers) < 3 * b.level:
+            world.assign_worker(b, v)
+        v.job = b.type # Some hold a job with no building, as after a full building took them
+    return game
+
+def load(save_dir, name):
+    game = HeadlessGame()
+    game.save_manager.save_dir = save_dir
+    if not game.save_manager.load_game(name):
+        raise RuntimeError(f"could not load {name} from {save_dir}")
+    return game
+
+def staffing(game):
+    return [(v.job, (v.assigned_building.x, v.assigned_building.y) if v.assigned_building else None)
+            for v in game.entity_manager.villagers]
+
+def check_loaded(game):
+    errors = []
+    villagers = game.entity_manager.villagers
+    stranded = [v for v in villagers if v.job != "Unemployed" and v.assigned_building is None]
+    if stranded:
+        errors.append(f"{len(stranded)} of {len(villagers)} villagers have a job but no workplace")
+    jobless = sum(1 for v in villagers if v.job == "Unemployed")
+    if jobless != len(game.entity_manager.unemployed):
+        errors.append(f"{jobless} unemployed villagers, {len(game.entity_manager.unemployed)} in the pool")
+    return errors
+
+def check_round_trip(game, save_dir):
+    game.save_manager.save_dir = save_dir
+    game.save_manager.save_game()
+    loaded = load(save_dir, game.world_name)
+    errors = check_loaded(loaded)
+    moved = sum(1 for before, after in zip(staffing(game), staffing(loaded)) if before[1] and before != after)
+    if moved:
+        errors.append(f"{moved} workers at a different workplace after a save and load")
+    return errors
+
+def check_legacy(game, save_dir):
+    # A save from before building ids and workplaces were recorded
+    data = game.save_manager.build_save_data()
+    for b in data["buildings"]:
+        del b["id"]
+    for v in data["villagers"]:
+        del v["workplace"]
+    json_dir = os.path.join(save_dir, "json")
+    binary_dir = os.path.join(save_dir, "binary")
+    os.makedirs(json_dir)
+    os.makedirs(binary_dir)
+    src = os.path.join(json_dir, "legacy.json")
+    with open(src, "w") as f:
+        json.dump(data, f)
+    convert(src, "binary", os.path.join(binary_dir, "legacy.sav"))
+
+    direct = load(json_dir, "legacy")
+    converted = load(binary_dir, "legacy")
+    errors = check_loaded(direct) + [f"converted: {e}" for e in check_loaded(converted)]
+    if staffing(converted) != staffing(direct):
+        errors.append("converted save loads different workplaces than the JSON it came from")
+    return errors
+
+def check_journal_convert(game, save_dir):
+    manager = game.save_manager
+    manager.save_dir = save_dir
+    manager.save_game()
+    # Changes that only make it into the journal
+    world = game.world
+    for b in list(world.buildings.values())[::9]:
+        world.remove_building(b.x, b.y)
+    game.resource_manager.inventory["wood"] += 123
+    manager.autosave()
+    manager.wait_for_save()
+    if not os.path.exists(manager.get_journal_path(game.world_name)):
+        return ["autosave wrote no journal"]
+
+    out_dir = os.path.join(save_dir, "converted")
+    os.makedirs(out_dir)
+    convert(manager.find_save(game.world_name), "json", os.path.join(out_dir, f"{game.world_name}.json"))
+    original = load(save_dir, game.world_name)
+    converted = load(out_dir, game.world_name)
+    errors = check_loaded(converted)
+    if len(converted.world.buildings) != len(world.buildings):
+        errors.append(f"converted save has {len(converted.world.buildings)} buildings, not {len(world.buildings)}")
+    if converted.resource_manager.inventory != original.resource_manager.inventory:
+        errors.append("converted save has a different inventory")
+    if staffing(converted) != staffing(original):
+        errors.append("converted save loads different workplaces")
+    return errors
+
+def check_readable_copy(game, save_dir):
+    manager = game.save_manager
+    manager.save_dir = save_dir
+    manager.save_format = "json"
+    manager.save_game() # An older JSON save of the world
+    manager.save_format = "binary"
+    manager.save_game()
+    copy = convert(manager.find_save(game.world_name), "json")
+    manager.autosave()
+    manager.wait_for_save()
+    manager.save_game()
+    errors = []
+    if os.path.dirname(os.path.abspath(copy)) == os.path.abspath(save_dir):
+        errors.append(f"readable copy written among the saves: {copy}")
+    if not os.path.exists(copy):
+        errors.append("a later save deleted the readable copy")
+    if manager.list_saves() != [game.world_name]:
+        errors.append(f"listed saves: {manager.list_saves()}")
+    if manager.find_save(game.world_name) != manager.get_save_path(game.world_name):
+        errors.append(f"loads {manager.find_save(game.world_name)}, not the latest save")
+    return errors
+
+def check_snapshot(game, save_dir):
+    manager = game.save_manager
+    snapshot = manager.snapshot()
+    before = manager.save_data(snapshot)
+    # Move the game on: a new day of production, staffing changes, villagers walking
+    world = game.world
+    for b in list(world.buildings.values())[::7]:
+        b.record_production(1.5, b.last_day + 1)
+        b.record_production(2.5, b.last_day, "steel")
+        b.buffers["gold"] += 1
+        world.upgrade_building(b)
+    for v in game.entity_manager.villagers[::5]:
+        v.x += 1
+        if v.assigned_building:
+            world.unassign_worker(v)
+    errors = []
+    if manager.save_data(snapshot) != before:
+        errors.append("snapshot changed with the live game")
+    return errors
+
+def snapshot_cost(game, repeats=5):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        game.save_manager.snapshot()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == "__main__":
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp) # SaveManager creates ./data
+        for seed in range(3):
+            game = build_colony(seed)
+            checks = (("round trip", check_round_trip), ("legacy JSON", check_legacy),
+                      ("journal convert", check_journal_convert), ("readable copy", check_readable_copy),
+                      ("snapshot", check_snapshot))
+            for label, check in checks:
+                with contextlib.redirect_stdout(io.StringIO()): # Silence "Game Saved/Loaded"
+                    errors = check(game, tempfile.mkdtemp(dir=tmp))
+                print(f"seed {seed} ({label}): {'OK' if not errors else 'FAIL'}")
+                for e in errors:
+                    print("   ", e)
+                failed = failed or bool(errors)
+
+        game = build_colony(0, buildings=2000, villagers=5000)
+        cost = snapshot_cost(game)
+        print(f"snapshot of 2000 buildings / 5000 villagers: {cost:.2f} ms "
+              f"({'over' if cost > SNAPSHOT_BUDGET_MS else 'within'} the {SNAPSHOT_BUDGET_MS:.0f} ms budget)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,64 @@
+import random
+import sys
+
+from src.config import TIME_SCALES
+from src.sim import HeadlessGame, elapsed_ticks, run_days
+
+# Checks that the headless runner stops exactly on the day boundary it was
+# asked for, at every speed and from mid-day, without running extra ticks.
+# Also checks that TickManager reports the speed it actually achieves when
+# ticks are too slow to keep up with the selected one.
+
+def check(speed, days, start_time=0, leftover_ms=0.0):
+    random.seed(speed)
+    game = HeadlessGame()
+    game.new_world(150)
+    tm = game.tick_manager
+    tm.time_scale = speed
+    tm.current_time = start_time
+    tm.accumulator = leftover_ms # Part of a tick carried over, as after a load mid-frame
+    expected = days * tm.total_cycle_time - start_time
+    ticks = run_days(game, days)
+    errors = []
+    if ticks != expected:
+        errors.append(f"ran {ticks} ticks, expected {expected}")
+    if tm.current_time != 0 or elapsed_ticks(tm) != days * tm.total_cycle_time:
+        errors.append(f"stopped at day {tm.day_counter}, tick {tm.current_time}")
+    return errors
+
+def achieved_speed(speed, tick_ms, frame_ms=16, frames=300):
+    # Every tick costs tick_ms of real time on the (virtual) clock
+    game = HeadlessGame()
+    game.new_world(150)
+    tm = game.tick_manager
+    tm.time_scale = speed
+    on_tick = tm.on_tick
+    def slow_tick():
+        on_tick()
+        game.clock.advance(tick_ms)
+    tm.on_tick = slow_tick
+    for _ in range(frames):
+        game.clock.advance(frame_ms)
+        tm.update()
+    return tm.effective_scale
+
+if __name__ == "__main__":
+    cases = [(speed, days, 0, 0.0) for speed in TIME_SCALES + [3, 7, 333] for days in (1, 2)]
+    cases += [(1000, 1, 500, 0.0), (100, 1, 1199, 0.0), (7, 1, 37, 999.0), (1000, 2, 0, 250.0)]
+
+    failed = False
+    for speed, days, start_time, leftover_ms in cases:
+        errors = check(speed, days, start_time, leftover_ms)
+        print(f"speed {speed:>4}, {days} day(s) from tick {start_time}: {'OK' if not errors else 'FAIL'}")
+        for e in errors:
+            print("   ", e)
+        failed = failed or bool(errors)
+
+    # (speed, real ms per tick, expected speed). At 1 ms a tick the 8 ms tick
+    # budget runs 8 ticks a frame, and a frame takes 16 + 8 ms: 333 ticks a second.
+    for speed, tick_ms, expected in ((10, 1, 10), (1000, 0, 1000), (1000, 1, 333)):
+        effective = achieved_speed(speed, tick_ms)
+        ok = abs(effective - expected) <= 0.05 * expected
+        print(f"speed {speed:>4} at {tick_ms} ms per tick: achieved {effective:.0f}x, expected {expected}x: {'OK' if ok else 'FAIL'}")
+        failed = failed or not ok
+    sys.exit(1 if failed else 0)